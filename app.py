@@ -4,6 +4,7 @@ import streamlit as st
 from core.config import APP_TITLE, load_settings
 from core.state import init_session_state
 from ui.analysis import render_analysis
+from ui.common import render_diagnostics
 from ui.simulation import render_simulation
 
 st.set_page_config(page_title=APP_TITLE, page_icon="🎓", layout="centered")
@@ -15,3 +16,6 @@ if st.session_state.simulation_mode:
     render_simulation(settings)
 else:
     render_analysis(settings)
+
+if settings.show_diagnostics:
+    render_diagnostics()
@@ -0,0 +1,84 @@
+"""시뮬레이션용 explicit context caching 정책 (비용 모델).
+
+보고서 호출 몇 번에는 explicit cache 저장료가 절감액보다 크지만(core/gemini.py 설계
+노트), 40턴짜리 시뮬레이션은 매 턴 같은 서류 + 사전 분석 자료를 다시 보낸다.
+그래서 세션마다 앞으로 TTL 동안 들어올 턴 수를 예측해, 예상 절감액이 저장료보다
+클 때만 짧은 TTL의 캐시를 만들고, 면접이 이어지면 갱신, 가치가 없어지면 삭제한다.
+
+예측 모델:
+- 남은 턴 수 = max(사전값 - 진행한 턴, 진행한 턴) — 오래 이어온 면접일수록 더
+  이어질 가능성이 높다는 가정(린디 효과).
+- TTL 동안의 호출 수 = min(남은 턴 수, TTL / 최근 턴 간격의 중앙값).
+- 절감액 = 호출 수 × 캐시 토큰 × (입력 단가 - 캐시 단가) × (1 - implicit 적중률)
+           - 캐시 토큰 × 저장 단가 × TTL.
+"""
+import statistics
+
+from core.config import (
+    CHARS_PER_TOKEN,
+    SIM_CACHE_MIN_TOKENS,
+    SIM_CACHE_STORAGE_PRICE_PER_HOUR,
+    SIM_CACHE_TTL_SECONDS,
+    SIM_CACHED_INPUT_PRICE,
+    SIM_DEFAULT_TURN_SECONDS,
+    SIM_EXPECTED_TURNS,
+    SIM_IMPLICIT_HIT_RATE,
+    SIM_INPUT_PRICE,
+)
+
+# decide_cache_action 결과
+CREATE = "create"
+REFRESH = "refresh"
+KEEP = "keep"
+DELETE = "delete"
+NONE = "none"
+
+# 남은 TTL이 이 비율 아래로 떨어지면 갱신한다
+_REFRESH_FRACTION = 0.5
+# 턴 간격 중앙값에 쓰는 최근 간격 수
+_RECENT_GAPS = 5
+
+
+def estimate_tokens(*texts: str) -> int:
+    return int(sum(len(text) for text in texts) / CHARS_PER_TOKEN)
+
+
+def predict_calls(turn_times: list[float], ttl_seconds: float = SIM_CACHE_TTL_SECONDS) -> float:
+    """앞으로 ttl_seconds 동안 들어올 것으로 예상되는 채팅 호출 수."""
+    turns_done = len(turn_times)
+    remaining_turns = max(SIM_EXPECTED_TURNS - turns_done, turns_done)
+    gaps = [later - earlier for earlier, later in zip(turn_times, turn_times[1:])][-_RECENT_GAPS:]
+    interval = max(statistics.median(gaps), 1.0) if gaps else SIM_DEFAULT_TURN_SECONDS
+    return min(remaining_turns, ttl_seconds / interval)
+
+
+def expected_savings(prefix_tokens: int, calls: float, ttl_seconds: float = SIM_CACHE_TTL_SECONDS) -> float:
+    """TTL 한 주기 동안 explicit cache로 아끼는 금액(USD). 음수면 캐시가 손해."""
+    millions = prefix_tokens / 1_000_000
+    saved = calls * millions * (SIM_INPUT_PRICE - SIM_CACHED_INPUT_PRICE) * (1 - SIM_IMPLICIT_HIT_RATE)
+    storage = millions * SIM_CACHE_STORAGE_PRICE_PER_HOUR * ttl_seconds / 3600
+    return saved - storage
+
+
+def decide_cache_action(
+    cache: dict | None,
+    prefix_tokens: int,
+    turn_times: list[float],
+    now: float,
+    ttl_seconds: float = SIM_CACHE_TTL_SECONDS,
+) -> str:
+    """현재 캐시 상태({"name", "expires_at"} 또는 None)에서 취할 조치.
+
+    만료된 캐시는 없는 것으로 본다 — 호출부는 CREATE/NONE을 받으면 기존 기록을 버린다.
+    """
+    worthwhile = (
+        prefix_tokens >= SIM_CACHE_MIN_TOKENS
+        and expected_savings(prefix_tokens, predict_calls(turn_times, ttl_seconds), ttl_seconds) > 0
+    )
+    if cache is None or now >= cache["expires_at"]:
+        return CREATE if worthwhile else NONE
+    if not worthwhile:
+        return DELETE
+    if cache["expires_at"] - now < ttl_seconds * _REFRESH_FRACTION:
+        return REFRESH
+    return KEEP
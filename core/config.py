@@ -18,6 +18,32 @@ DEFAULT_TARGET_EXAM = "KAIST 신입생 선발 면접"
 # 과금 폭탄과 gemini-3.1-pro의 200K 토큰 초과 시 2배 요금 구간 진입을 막는다.
 MAX_DOC_CHARS = 150_000
 
+# PDF 추출 백엔드 보정용 샘플 PDF 폴더 (core/pdf.select_backend). 없으면 기본 선호 순서로 고른다.
+# 실제 서류와 비슷한 텍스트형 PDF(개인정보를 지운 생기부/자소서 등) 몇 개를 넣어두면 된다.
+PDF_CALIBRATION_DIR = "pdf_samples"
+
+# 서버 전역 LLM 작업 실행기 (core/jobs.py)
+# 워커 수 = 프로세스 전체의 동시 LLM 호출 상한. 그중 일부는 채팅 턴 전용으로 남겨
+# 보고서 생성이 몰려도 면접 채팅이 밀리지 않게 한다.
+JOB_WORKERS = 8
+JOB_RESERVED_INTERACTIVE = 2
+# 결과를 가져가지 않은 완료 작업(탭을 닫은 세션 등)을 보관하는 시간
+JOB_RETENTION_SECONDS = 3600
+# 업로드 즉시 PDF 추출/검증을 돌리는 워커 수 (CPU 작업이라 LLM 워커 풀과 분리)
+EXTRACTION_WORKERS = 2
+
+# 시뮬레이션 explicit context caching 비용 모델 (core/caching.py) — FLASH_MODEL 기준.
+# 가격(USD)은 1M 토큰당. 가격이 바뀌면 이 값만 고치면 된다.
+SIM_INPUT_PRICE = 1.50
+SIM_CACHED_INPUT_PRICE = 0.15
+SIM_CACHE_STORAGE_PRICE_PER_HOUR = 1.00
+SIM_CACHE_TTL_SECONDS = 600        # 짧은 TTL로 만들고 면접이 이어지는 동안 갱신한다
+SIM_CACHE_MIN_TOKENS = 4096        # explicit cache 최소 크기 — 이보다 작으면 만들 수 없다
+SIM_IMPLICIT_HIT_RATE = 0.5        # explicit cache 없이도 implicit caching으로 기대되는 적중률
+SIM_EXPECTED_TURNS = 20            # 턴 수 예측의 사전값 (한 회차 면접의 일반적인 길이)
+SIM_DEFAULT_TURN_SECONDS = 60      # 턴 간격 측정값이 없을 때 가정하는 답변 시간
+CHARS_PER_TOKEN = 1.3              # 한국어 위주 텍스트의 토큰 수 추정 비율
+
 # PROMPT_SECRET 안의 레거시 플레이스홀더 — 서류 원문은 프롬프트 치환이 아니라
 # 별도의 사용자 콘텐츠로 전달되므로, 모델이 중괄호 문자열을 그대로 보지 않도록 안내문으로 바꾼다.
 _PLACEHOLDER_NOTES = {
@@ -39,6 +65,7 @@ class Settings:
     pro_model: str
     flash_model: str
     target_exam: str
+    show_diagnostics: bool = False  # 운영자용 진단 패널 (secrets의 SHOW_DIAGNOSTICS)
 
 
 def load_settings() -> Settings:
@@ -61,4 +88,5 @@ def load_settings() -> Settings:
         pro_model=st.secrets.get("PRO_MODEL", DEFAULT_PRO_MODEL),
         flash_model=st.secrets.get("FLASH_MODEL", DEFAULT_FLASH_MODEL),
         target_exam=st.secrets.get("TARGET_EXAM", DEFAULT_TARGET_EXAM),
+        show_diagnostics=bool(st.secrets.get("SHOW_DIAGNOSTICS", False)),
     )
@@ -1,23 +1,44 @@
 """google-genai SDK 래퍼.
 
 설계 노트:
-- 구 SDK(google-generativeai)의 explicit context caching(CachedContent)은 제거했다.
-  1시간 TTL 저장료(특히 Pro 캐시 $4.50/1M tokens/hr) 때문에 이 워크로드에서는
-  캐싱을 안 쓰는 것보다 오히려 비쌌고, 캐시 만료 시 복구 불가 데드엔드 버그의
-  원인이었다. 대신 매 호출에서 시스템 프롬프트 + 서류 원문을 동일한 순서로
-  앞부분에 고정 배치해 Gemini의 implicit caching(2.5+ 기본 활성, 저장료 없음)
-  할인을 유도한다.
+- 보고서 호출에는 explicit context caching(CachedContent)을 쓰지 않는다. 1시간 TTL
+  저장료(특히 Pro 캐시 $4.50/1M tokens/hr) 때문에 세션당 몇 번의 Pro 호출에서는
+  캐싱을 안 쓰는 것보다 오히려 비쌌다. 대신 Gemini의 implicit caching(2.5+ 기본
+  활성, 저장료 없음) 할인을 유도한다.
+- 긴 시뮬레이션만 예외다. core/caching.py의 비용 모델이 이득이라고 판단할 때만
+  짧은 TTL의 explicit cache(공통 앞부분 + 첫 턴)를 만들어 채팅에 붙인다. 캐시가
+  만료/삭제되어 호출이 실패하면(is_cache_missing) 캐시 없이 대화 기록으로 세션을
+  재구성해 같은 턴을 다시 보낸다 — 구 SDK 시절의 만료 데드엔드가 생기지 않는다.
+- implicit caching은 요청 앞부분이 바이트 단위로 같아야 맞는다. 그래서 모든 호출
+  경로(보고서, 시뮬레이션 시작, 채팅 재구성)가 build_prefix()가 만드는 같은 앞부분
+  — 시스템 프롬프트 + [서류 user 턴, 확인 model 턴] — 으로 시작하고, 호출마다
+  달라지는 내용(사전 분석 자료, 대화 기록, 명령어)은 모두 그 뒤에 붙인다.
+  캐시는 모델별로 분리되므로 Pro 호출끼리, Flash 채팅 턴끼리 이 앞부분을 공유한다.
+  실제 적중률은 응답의 usage_metadata로 집계한다 (cache_usage_stats).
+- 단발 보고서 호출은 프로세스 전역 single-flight로 감싼다. 모델·시스템 프롬프트·
+  전송 콘텐츠가 완전히 같은 요청이 동시에 들어오면(더블 클릭, rerun, 여러 탭)
+  한 번만 호출하고 결과/오류를 공유한다.
 - 시뮬레이션 채팅은 SDK의 chats 세션을 사용한다. 대화 기록은 SDK가 관리하며,
   세션이 유실되면 st.session_state의 메시지 목록으로 언제든 재구성할 수 있다.
+- 스트리밍 답변이 중간에 일시 오류로 끊기면 세션을 버리지 않고 그 자리에서 다시
+  요청한다. 이미 받은 부분이 있으면 모델에게 그 뒤부터 이어 쓰게 하고, 이어 붙인
+  답변을 채팅 기록에 직접 기록한다 (stream_chat_reply).
 """
+import hashlib
+import json
+import threading
 import time
+from typing import Callable
 
+import httpx
 from google import genai
 from google.genai import errors, types
 
 import streamlit as st
 
-# 시뮬레이션 시작 시 서류를 전달받았음을 확인하는 고정 응답 (history 재구성용)
+from core.singleflight import SingleFlight
+
+# 서류 user 턴 뒤에 붙는 고정 model 턴 (모든 호출의 공통 앞부분)
 _DOCS_ACK = "네, 제출된 생활기록부와 자기소개서를 모두 확인했습니다. 준비되었습니다."
 
 # 일시적 오류(과부하/속도 제한)로 판단해 자동 재시도하는 HTTP 상태 코드
@@ -25,6 +46,13 @@ _RETRYABLE_CODES = {429, 500, 502, 503, 504}
 _MAX_ATTEMPTS = 3
 _BACKOFF_SECONDS = 2.0
 
+# 스트리밍 도중 끊긴 답변을 이어 받는 최대 횟수와, 이어 쓰기를 요청하는 지시문
+_MAX_STREAM_RESUMES = 2
+_CONTINUE_PROMPT = (
+    "[시스템 안내] 연결이 끊겨 바로 위 답변이 중간에 잘렸습니다. 잘린 지점 바로 다음부터 "
+    "이어서 끝까지 작성해주세요. 이미 작성한 부분은 반복하지 마세요."
+)
+
 
 class EmptyResponseError(RuntimeError):
     """모델이 빈 응답을 반환 (안전 필터 차단 또는 일시 장애)."""
@@ -34,11 +62,69 @@ def _is_retryable(exc: Exception) -> bool:
     return isinstance(exc, errors.APIError) and exc.code in _RETRYABLE_CODES
 
 
+def is_stream_interruption(exc: Exception) -> bool:
+    """스트리밍 도중의 일시 오류(과부하/속도 제한/연결 끊김/타임아웃)인지."""
+    return _is_retryable(exc) or isinstance(exc, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
 @st.cache_resource
 def get_client(api_key: str) -> genai.Client:
     return genai.Client(api_key=api_key)
 
 
+@st.cache_resource
+def _report_flight() -> SingleFlight:
+    return SingleFlight()
+
+
+def report_flight_stats() -> dict[str, int]:
+    """보고서 호출의 실제 발행 수(issued) / 진행 중 호출에 합류한 수(coalesced)."""
+    return _report_flight().stats()
+
+
+def _request_key(model: str, system_prompt: str, contents: list[types.Content]) -> str:
+    serialized = [content.model_dump(mode="json", exclude_none=True) for content in contents]
+    payload = json.dumps([model, system_prompt, serialized], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _CacheUsage:
+    """모델별 입력 토큰 / implicit cache 적중 토큰 누적 (프로세스 전역)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: dict[str, list[int]] = {}
+
+    def record(self, model: str, usage) -> None:
+        if usage is None:
+            return
+        with self._lock:
+            totals = self._totals.setdefault(model, [0, 0])
+            totals[0] += usage.prompt_token_count or 0
+            totals[1] += usage.cached_content_token_count or 0
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                model: {
+                    "prompt_tokens": prompt,
+                    "cached_tokens": cached,
+                    "hit_ratio": cached / prompt if prompt else 0.0,
+                }
+                for model, (prompt, cached) in self._totals.items()
+            }
+
+
+@st.cache_resource
+def _cache_usage() -> _CacheUsage:
+    return _CacheUsage()
+
+
+def cache_usage_stats() -> dict[str, dict[str, float]]:
+    """모델별 누적 입력 토큰, 캐시 적중 토큰, 적중률 (응답 usage_metadata 기준)."""
+    return _cache_usage().stats()
+
+
 def build_docs_block(life_record: str, cover_letter: str) -> str:
     return (
         "--- [사용자 제출 자료] ---\n"
@@ -47,6 +133,25 @@ def build_docs_block(life_record: str, cover_letter: str) -> str:
     )
 
 
+def _user(*texts: str) -> types.Content:
+    return types.Content(role="user", parts=[types.Part(text=text) for text in texts])
+
+
+def build_prefix(life_record: str, cover_letter: str) -> list[types.Content]:
+    """모든 호출이 공유하는 고정 앞부분. 이 뒤에만 호출별 내용을 붙여야 캐시가 맞는다."""
+    return [
+        _user(build_docs_block(life_record, cover_letter)),
+        types.Content(role="model", parts=[types.Part(text=_DOCS_ACK)]),
+    ]
+
+
+def interview_opening(context_reports: str | None, start_prompt: str) -> str:
+    """시뮬레이션의 첫 user 턴: (사전 분석 자료) + 시작 명령어. 재구성 시에도 같은 문자열을 쓴다."""
+    if not context_reports:
+        return start_prompt
+    return f"--- [사전 분석 자료] ---\n{context_reports}\n\n{start_prompt}"
+
+
 def generate_report(
     client: genai.Client,
     model: str,
@@ -58,14 +163,22 @@ def generate_report(
 ) -> str:
     """서류 + (선택) 추가 컨텍스트 + 명령어로 단발 생성 호출을 수행한다.
 
-    implicit caching 히트율을 위해 서류 블록을 항상 첫 파트에 고정한다.
+    implicit caching 히트율을 위해 공통 앞부분(build_prefix) 뒤에 추가 컨텍스트와 명령어를 붙인다.
     단발(멱등) 호출이므로 429/5xx 일시 오류와 빈 응답은 최대 3회까지 자동 재시도한다.
+    같은 요청이 이미 진행 중이면 새로 호출하지 않고 그 결과를 기다린다.
     """
-    parts = [build_docs_block(life_record, cover_letter)]
-    if extra_context:
-        parts.append(extra_context)
-    parts.append(command)
+    tail = [extra_context, command] if extra_context else [command]
+    contents = build_prefix(life_record, cover_letter) + [_user(*tail)]
+
+    return _report_flight().do(
+        _request_key(model, system_prompt, contents),
+        lambda: _generate_with_retry(client, model, system_prompt, contents),
+    )
 
+
+def _generate_with_retry(
+    client: genai.Client, model: str, system_prompt: str, contents: list[types.Content]
+) -> str:
     last_exc: Exception | None = None
     for attempt in range(_MAX_ATTEMPTS):
         if attempt:
@@ -73,7 +186,7 @@ def generate_report(
         try:
             response = client.models.generate_content(
                 model=model,
-                contents=parts,
+                contents=contents,
                 config=types.GenerateContentConfig(system_instruction=system_prompt),
             )
         except Exception as exc:
@@ -81,6 +194,7 @@ def generate_report(
                 last_exc = exc
                 continue
             raise
+        _cache_usage().record(model, getattr(response, "usage_metadata", None))
         text = (response.text or "").strip()
         if text:
             return text
@@ -105,34 +219,156 @@ def create_interview_chat(
     context_reports: str | None = None,
     prior_messages: list[dict] | None = None,
     start_prompt: str | None = None,
+    cached_content: str | None = None,
 ):
     """면접 시뮬레이션용 채팅 세션을 만든다.
 
-    서류(+기존 분석 결과)를 첫 user 턴으로 넣어 이후 모든 턴에서 참조되게 한다.
-    세션 복구 시에는 prior_messages(화면에 표시된 대화)와 최초 start_prompt를
-    그대로 재주입해 진행 중이던 면접을 이어간다.
+    history는 보고서 호출과 같은 공통 앞부분(build_prefix)으로 시작한다. 새 면접은
+    open_interview로 시작하고, 세션 복구 시에는 최초 첫 턴(interview_opening)과
+    prior_messages(화면에 표시된 대화)를 그대로 재주입해 진행 중이던 면접을 이어간다
+    — 원래 세션과 바이트 단위로 같은 history가 되므로 캐시 적중도 유지된다.
+
+    cached_content(create_interview_cache의 이름)를 주면 시스템 프롬프트 + 앞부분 +
+    첫 턴 + 첫 질문은 캐시에 있으므로, history에는 그 뒤의 대화만 넣는다.
     """
-    docs = build_docs_block(life_record, cover_letter)
-    if context_reports:
-        docs += f"\n\n--- [사전 분석 자료] ---\n{context_reports}"
+    config = interview_config(system_prompt, cached_content)
+    if cached_content:
+        return client.chats.create(
+            model=model,
+            config=config,
+            history=_history_from_messages((prior_messages or [])[1:]),
+        )
 
-    history = [
-        types.Content(role="user", parts=[types.Part(text=docs)]),
-        types.Content(role="model", parts=[types.Part(text=_DOCS_ACK)]),
-    ]
+    history = build_prefix(life_record, cover_letter)
     if prior_messages:
-        if start_prompt:
-            history.append(types.Content(role="user", parts=[types.Part(text=start_prompt)]))
+        history.append(_user(interview_opening(context_reports, start_prompt or "")))
         history.extend(_history_from_messages(prior_messages))
 
-    return client.chats.create(
+    return client.chats.create(model=model, config=config, history=history)
+
+
+def interview_config(system_prompt: str, cached_content: str | None = None) -> types.GenerateContentConfig:
+    """면접 채팅 요청 설정. 캐시를 쓰면 시스템 프롬프트는 캐시 안에 있다."""
+    if cached_content:
+        return types.GenerateContentConfig(cached_content=cached_content)
+    return types.GenerateContentConfig(system_instruction=system_prompt)
+
+
+def create_interview_cache(
+    client: genai.Client,
+    model: str,
+    system_prompt: str,
+    life_record: str,
+    cover_letter: str,
+    context_reports: str | None,
+    start_prompt: str,
+    first_question: str,
+    ttl_seconds: int,
+) -> str:
+    """시뮬레이션의 고정 부분(공통 앞부분 + 첫 턴 + 첫 질문)을 explicit cache로 만들고 이름을 반환한다."""
+    contents = build_prefix(life_record, cover_letter) + [
+        _user(interview_opening(context_reports, start_prompt)),
+        types.Content(role="model", parts=[types.Part(text=first_question)]),
+    ]
+    cache = client.caches.create(
         model=model,
-        config=types.GenerateContentConfig(system_instruction=system_prompt),
-        history=history,
+        config=types.CreateCachedContentConfig(
+            system_instruction=system_prompt,
+            contents=contents,
+            ttl=f"{ttl_seconds}s",
+        ),
     )
+    return cache.name
+
+
+def refresh_interview_cache(client: genai.Client, name: str, ttl_seconds: int) -> None:
+    client.caches.update(name=name, config=types.UpdateCachedContentConfig(ttl=f"{ttl_seconds}s"))
 
 
-def stream_chat_reply(chat, message: str):
-    """chat.send_message_stream 청크를 st.write_stream에 바로 넘길 수 있는 제너레이터."""
-    for chunk in chat.send_message_stream(message):
-        yield chunk.text or ""
+def delete_interview_cache(client: genai.Client, name: str) -> None:
+    """캐시를 지운다. 이미 만료/삭제된 경우는 무시한다 (어차피 TTL이 지나면 사라진다)."""
+    try:
+        client.caches.delete(name=name)
+    except errors.APIError:
+        pass
+
+
+def is_cache_missing(exc: Exception) -> bool:
+    """채팅 호출이 붙어 있던 explicit cache가 만료/삭제되어 실패했는지."""
+    return (
+        isinstance(exc, errors.APIError)
+        and exc.code in (400, 403, 404)
+        and "cache" in str(exc).lower()
+    )
+
+
+def open_interview(
+    client: genai.Client,
+    model: str,
+    system_prompt: str,
+    life_record: str,
+    cover_letter: str,
+    context_reports: str | None,
+    start_prompt: str,
+):
+    """새 면접 채팅을 만들고 첫 질문을 받는다. (chat, 첫 질문)을 반환한다."""
+    chat = create_interview_chat(client, model, system_prompt, life_record, cover_letter)
+    response = chat.send_message(interview_opening(context_reports, start_prompt))
+    _cache_usage().record(model, getattr(response, "usage_metadata", None))
+    return chat, (response.text or "").strip()
+
+
+def stream_chat_reply(
+    chat,
+    message: str,
+    model: str,
+    client: genai.Client | None = None,
+    config: types.GenerateContentConfig | None = None,
+    on_recover: Callable[[float], None] | None = None,
+):
+    """chat.send_message_stream 청크를 st.write_stream에 바로 넘길 수 있는 제너레이터.
+
+    model은 chat 세션을 만들 때 쓴 모델명, config는 그때의 설정(interview_config)이다.
+    client를 주면 스트림이 일시 오류로 끊겼을 때 받은 청크를 보존한 채 그 자리에서
+    다시 요청한다 — 받은 부분이 있으면 이어 쓰기를 지시하고, 없으면 같은 턴을 다시
+    보낸다. 끊긴 시점부터 다시 청크를 받기까지 걸린 시간(초)을 on_recover로 알린다.
+    SDK는 끝까지 받지 못한 턴을 기록하지 않으므로, 이어 받은 답변은 여기서 직접
+    채팅 기록에 넣는다. 재시도를 다 써도 실패하면 예외를 그대로 올린다 (기록은 그대로).
+    """
+    user_turn = _user(message)
+    history = list(chat.get_history(curated=True))
+    received: list[str] = []
+    usage = None
+    resumes = 0
+    failed_at: float | None = None
+    stream = chat.send_message_stream(message)
+    while True:
+        try:
+            for chunk in stream:
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                if failed_at is not None:
+                    if on_recover is not None:
+                        on_recover(time.monotonic() - failed_at)
+                    failed_at = None
+                text = chunk.text or ""
+                received.append(text)
+                yield text
+            break
+        except Exception as exc:
+            if client is None or resumes >= _MAX_STREAM_RESUMES or not is_stream_interruption(exc):
+                raise
+            resumes += 1
+            if failed_at is None:
+                failed_at = time.monotonic()
+            time.sleep(_BACKOFF_SECONDS * (2 ** (resumes - 1)))
+            contents = history + [user_turn]
+            if partial := "".join(received):
+                contents += [types.Content(role="model", parts=[types.Part(text=partial)]), _user(_CONTINUE_PROMPT)]
+            stream = client.models.generate_content_stream(model=model, contents=contents, config=config)
+
+    if failed_at is not None and on_recover is not None:
+        on_recover(time.monotonic() - failed_at)  # 이어 받은 부분이 비어 있던 경우
+    if resumes:
+        reply = types.Content(role="model", parts=[types.Part(text="".join(received))])
+        chat.record_history(user_input=user_turn, model_output=[reply], is_valid=True)
+    _cache_usage().record(model, usage)
@@ -0,0 +1,270 @@
+"""서버 전역 LLM 작업 실행기: 제한된 워커 풀 + 우선순위 + 세션 간 공정성.
+
+Streamlit 스크립트 안에서 바로 호출하면 사용자가 다른 위젯을 누르거나 탭을 닫는
+순간 작업이 버려지고, 동시에 몰린 Pro 보고서 호출이 지연에 민감한 Flash 채팅을
+굶긴다. 그래서 LLM 호출은 작업(Job)으로 제출하고, UI는 상태를 폴링하다가 이후
+rerun에서 결과를 가져간다.
+
+스케줄링 규칙 (대기열에서 다음 작업을 고를 때):
+1. 우선순위 클래스가 낮은 숫자부터 (채팅 → 초기 분석 → 심층 보고서/배치).
+2. 같은 클래스 안에서는 가장 오래전에 작업을 시작한 세션부터(라운드 로빈) — 한
+   세션이 여러 보고서를 연달아 눌러도 다른 세션의 작업이 뒤로 밀리지 않는다.
+3. 그다음 제출 순서.
+워커 중 reserved_interactive개는 채팅 전용으로 남겨, 보고서가 풀을 가득 채워도
+채팅 턴은 바로 시작된다.
+
+작업 함수는 서류 원문이나 PDF bytes를 클로저로 잡고 있으므로 실행이 끝나는 즉시
+버리고, 결과를 가져간 작업(discard)과 보존 기간이 지난 작업은 실행기에서 지운다.
+보존 기간 정리는 새 제출이 없어도 유휴 워커가 주기적으로 한다.
+
+워커 스레드에는 Streamlit 스크립트 컨텍스트가 없으므로 작업 함수는 st.session_state에
+접근하면 안 된다 — 필요한 값은 제출 시점에 캡처해서 넘긴다.
+"""
+import itertools
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+import streamlit as st
+
+from core.config import EXTRACTION_WORKERS, JOB_RESERVED_INTERACTIVE, JOB_RETENTION_SECONDS, JOB_WORKERS
+
+# 우선순위 클래스 (작을수록 먼저)
+PRIORITY_CHAT = 0
+PRIORITY_INITIAL = 1
+PRIORITY_REPORT = 2
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# 보존 기간이 지난 작업을 정리하는 최대 주기 (초)
+_PRUNE_INTERVAL_SECONDS = 60
+
+
+class JobCancelledError(RuntimeError):
+    """대기 중이던 작업이 실행 전에 취소됨 (세션 리셋 등)."""
+
+
+@dataclass(eq=False)
+class Job:
+    id: str
+    session_id: str
+    priority: int
+    fn: Callable[["Job"], Any] | None  # 실행이 끝나면(또는 취소되면) None
+    seq: int
+    meta: dict = field(default_factory=dict)
+    status: str = QUEUED
+    result: Any = None
+    error: Exception | None = None
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: float | None = None
+    finished_at: float | None = None
+    chunks: list[str] = field(default_factory=list)
+    _changed: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def emit(self, chunk: str) -> None:
+        """(작업 함수에서) 스트리밍 중간 결과를 내보낸다."""
+        with self._changed:
+            self.chunks.append(chunk)
+            self._changed.notify_all()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        with self._changed:
+            return self._changed.wait_for(lambda: self.finished, timeout)
+
+    def stream(self) -> Iterator[str]:
+        """emit된 청크를 순서대로 내보내는 제너레이터 (st.write_stream용). 실패하면 그 예외를 다시 던진다."""
+        sent = 0
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: len(self.chunks) > sent or self.finished)
+                pending = self.chunks[sent:]
+                finished = self.finished
+            yield from pending
+            sent += len(pending)
+            if finished and sent == len(self.chunks):
+                break
+        if self.error is not None:
+            raise self.error
+
+    def _finish(self, status: str, result: Any = None, error: Exception | None = None) -> None:
+        with self._changed:
+            self.status, self.result, self.error = status, result, error
+            self.finished_at = time.monotonic()
+            self._changed.notify_all()
+
+
+class JobRunner:
+    def __init__(
+        self,
+        max_workers: int = JOB_WORKERS,
+        reserved_interactive: int = JOB_RESERVED_INTERACTIVE,
+        retention_seconds: float = JOB_RETENTION_SECONDS,
+    ):
+        self._max_workers = max_workers
+        self._background_slots = max(1, max_workers - reserved_interactive)
+        self._retention = retention_seconds
+        self._prune_interval = min(_PRUNE_INTERVAL_SECONDS, retention_seconds)
+        self._lock = threading.Condition()
+        self._queue: list[Job] = []
+        self._jobs: dict[str, Job] = {}
+        self._last_started: dict[str, float] = {}  # session_id -> 마지막 작업 시작 시각
+        self._running = 0
+        self._running_background = 0
+        self._seq = itertools.count()
+        self._workers: list[threading.Thread] = []
+
+    def submit(self, session_id: str, priority: int, fn: Callable[[Job], Any], **meta) -> Job:
+        with self._lock:
+            job = Job(
+                id=uuid.uuid4().hex, session_id=session_id, priority=priority,
+                fn=fn, seq=next(self._seq), meta=meta,
+            )
+            self._jobs[job.id] = job
+            self._queue.append(job)
+            self._prune()
+            self._ensure_workers()
+            self._lock.notify_all()
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def queue_position(self, job_id: str) -> int | None:
+        """대기 중인 작업의 순번 (1 = 다음 차례). 대기 중이 아니면 None."""
+        with self._lock:
+            for position, job in enumerate(sorted(self._queue, key=self._order), start=1):
+                if job.id == job_id:
+                    return position
+        return None
+
+    def cancel_session(self, session_id: str) -> int:
+        """세션의 대기 중 작업을 취소한다 (이미 실행 중인 작업은 끝까지 돈다)."""
+        with self._lock:
+            cancelled = [job for job in self._queue if job.session_id == session_id]
+            self._queue = [job for job in self._queue if job.session_id != session_id]
+        for job in cancelled:
+            job.fn = None
+            job._finish(CANCELLED, error=JobCancelledError("작업이 취소되었습니다."))
+        return len(cancelled)
+
+    def discard(self, job_id: str) -> None:
+        """더는 필요 없는 작업을 실행기에서 지운다. 대기 중이면 취소되어 실행되지 않고,
+        실행 중이면 끝까지 돈 뒤 버려진다."""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            queued = job is not None and job in self._queue
+            if queued:
+                self._queue.remove(job)
+        if queued:
+            job.fn = None
+            job._finish(CANCELLED, error=JobCancelledError("작업이 취소되었습니다."))
+
+    def discard_session(self, session_id: str) -> None:
+        """세션의 대기 중 작업을 취소하고, 세션의 모든 작업(결과 포함)을 실행기에서 지운다."""
+        self.cancel_session(session_id)
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items() if job.session_id == session_id]:
+                del self._jobs[job_id]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "queued": len(self._queue),
+                "running": self._running,
+                "workers": len(self._workers),
+            }
+
+    # --- 내부 ---
+
+    def _order(self, job: Job) -> tuple[int, float, int]:
+        return job.priority, self._last_started.get(job.session_id, float("-inf")), job.seq
+
+    def _next_job(self) -> Job | None:
+        """실행 가능한 다음 작업을 대기열에서 꺼낸다. self._lock을 잡은 상태에서 호출."""
+        candidates = self._queue
+        if self._running_background >= self._background_slots:
+            candidates = [job for job in candidates if job.priority == PRIORITY_CHAT]
+        if not candidates:
+            return None
+        job = min(candidates, key=self._order)
+        self._queue.remove(job)
+        return job
+
+    def _ensure_workers(self) -> None:
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        while len(self._workers) < self._max_workers:
+            worker = threading.Thread(target=self._work, name=f"job-worker-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                job = self._next_job()
+                while job is None:
+                    self._lock.wait(self._prune_interval)
+                    self._prune()
+                    job = self._next_job()
+                background = job.priority != PRIORITY_CHAT
+                self._running += 1
+                self._running_background += background
+                job.status = RUNNING
+                job.started_at = self._last_started[job.session_id] = time.monotonic()
+            try:
+                self._run(job)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._running_background -= background
+                    self._lock.notify_all()
+
+    @staticmethod
+    def _run(job: Job) -> None:
+        # 작업 함수(와 클로저가 잡은 서류 원문)는 실행이 끝나면 바로 놓는다.
+        fn, job.fn = job.fn, None
+        try:
+            job._finish(DONE, result=fn(job))
+        except Exception as exc:
+            job._finish(FAILED, error=exc)
+        except BaseException as exc:
+            # st.stop()/SystemExit 등 — 작업만 실패로 끝내고 워커는 계속 돈다.
+            # (그대로 두면 작업이 RUNNING에 멈춰 wait/stream이 영원히 기다린다.)
+            error = RuntimeError(f"작업이 비정상 종료되었습니다 ({type(exc).__name__}).")
+            error.__cause__ = exc
+            job._finish(FAILED, error=error)
+
+    def _prune(self) -> None:
+        """결과를 가져가지 않은 채 보존 기간이 지난 작업을 버린다 (탭을 닫은 세션 등). self._lock을 잡은 상태에서 호출."""
+        cutoff = time.monotonic() - self._retention
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        for session_id, started_at in list(self._last_started.items()):
+            if started_at < cutoff:
+                del self._last_started[session_id]
+
+
+@st.cache_resource
+def get_job_runner() -> JobRunner:
+    return JobRunner()
+
+
+@st.cache_resource
+def get_extraction_runner() -> JobRunner:
+    """업로드 직후 PDF 추출용 실행기. CPU 작업이 LLM 워커를 차지하지 않도록 따로 둔다."""
+    return JobRunner(max_workers=EXTRACTION_WORKERS, reserved_interactive=0)
@@ -1,4 +1,8 @@
 """AI 생성 보고서 파싱."""
+import random
+import re
+import zlib
+from dataclasses import dataclass
 
 # 초기 분석 보고서에서 '대표 질문' 섹션을 찾는 마커 후보 (앞에서부터 우선 적용).
 # 첫 번째 마커는 PROMPT_SECRET에 동일 문자열을 넣어두면 가장 정확하게 동작한다.
@@ -8,6 +12,41 @@ QUESTION_MARKERS = (
     "대표 질문",
 )
 
+# 질문 출처 (Question.source) 와 id 접두어
+SOURCE_INITIAL = "initial"
+SOURCE_ADDITIONAL = "additional"
+_ID_PREFIXES = {SOURCE_INITIAL: "I", SOURCE_ADDITIONAL: "A"}
+
+# 번호가 붙은 질문 줄: "1.", "2)", "Q3.", "**4.**", "- 5." 등
+# 마크다운 제목 줄("### 1. 학업 역량")은 질문이 아니라 보고서 섹션이므로 받지 않는다.
+_NUMBERED_LINE = re.compile(r"^(\s*)(?:[-*]\s*)?(?:\*\*)?\s*Q?\s*(\d{1,2})\s*[.):]\s*(?:\*\*)?\s*(.*)$")
+# 줄 전체가 굵은 글씨인 번호 줄 ("**1. 학업 역량 검증**") — 질문이 아니라 분류 제목
+_BOLD_LINE = re.compile(r"^\s*\*\*[^*]+\*\*\s*$")
+# 질문이 인용하는 서류 문구: “…”, "…", ‘…’, '…', 「…」, 『…』
+_QUOTED_PHRASE = re.compile(r"[“\"‘'「『]([^“”\"‘’'「」『』\n]{2,80})[”\"’'」』]")
+
+# MinHash 근사 중복 판정 파라미터.
+# 한국어 질문은 짧고 어미만 바뀌는 경우가 많아 공백/문장부호를 제거한 문자 3-gram을 쓴다.
+_SHINGLE_SIZE = 3
+_NUM_PERM = 64
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)  # 프로세스/세션과 무관하게 같은 서명이 나오도록 고정 시드
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(_NUM_PERM)
+]
+# 질문 본문(마지막 서술어를 뺀 부분)끼리 비교한다. 한국어 질문은 "…에서 맡은 역할은
+# 무엇이었나요?"처럼 틀이 같고 주제어만 다른 경우가 많아, 틀에 해당하는 서술어를 빼고
+# 높은 기준으로 판정해야 주제가 다른 질문이 합쳐지지 않는다.
+DUPLICATE_THRESHOLD = 0.85
+
+
+@dataclass(frozen=True)
+class Question:
+    id: str            # 출처 접두어 + 번호 (예: "I1", "A12")
+    text: str          # 질문 본문 (첫 줄, 마크다운 강조 제거)
+    source: str        # SOURCE_INITIAL / SOURCE_ADDITIONAL
+    doc_ref: str = ""  # 질문이 인용한 서류 문구 (없으면 빈 문자열)
+
 
 def parse_questions_from_report(text_block: str, markers: tuple[str, ...] = QUESTION_MARKERS) -> str:
     """마커 이후의 텍스트(질문 목록)를 추출한다. 마커가 없으면 원문 전체를 반환한다."""
@@ -18,3 +57,151 @@ def parse_questions_from_report(text_block: str, markers: tuple[str, ...] = QUES
         if found:
             return tail.strip()
     return text_block
+
+
+def split_report(text_block: str, markers: tuple[str, ...] = QUESTION_MARKERS) -> tuple[str, str]:
+    """(질문 섹션 앞의 분석 본문, 질문 섹션)으로 나눈다. 마커가 없으면 본문 없이 원문 전체를 질문 섹션으로 본다."""
+    if not text_block:
+        return "", ""
+    for marker in markers:
+        head, found, tail = text_block.partition(marker)
+        if found:
+            return head.strip(), tail.strip()
+    return "", text_block
+
+
+def question_section(text_block: str, markers: tuple[str, ...] = QUESTION_MARKERS) -> str:
+    """마커 이후의 질문 섹션. 마커가 없으면 빈 문자열 — 분석 본문의 번호 목록을 질문으로 오인하지 않도록."""
+    for marker in markers:
+        _, found, tail = (text_block or "").partition(marker)
+        if found:
+            return tail.strip()
+    return ""
+
+
+def _clean(line: str) -> str:
+    return line.replace("**", "").replace("__", "").strip()
+
+
+def parse_question_list(text_block: str, source: str) -> list[Question]:
+    """번호가 붙은 질문 목록을 Question 레코드로 변환한다.
+
+    번호 줄 아래의 들여쓴 줄(질문 의도, 근거, 번호 붙은 꼬리 질문 등)은 같은 질문에
+    속한 것으로 보고 인용 문구(doc_ref)를 찾는 데만 사용한다. 줄 전체가 굵은 글씨인
+    번호 줄은 분류 제목으로 보고 건너뛴다. 번호 붙은 줄이 없으면 빈 목록을 반환한다.
+    """
+    items: list[tuple[str, list[str]]] = []
+    base_indent: int | None = None  # 첫 질문 줄의 들여쓰기 — 이보다 깊으면 하위 항목
+    for line in (text_block or "").splitlines():
+        match = _NUMBERED_LINE.match(line)
+        indent = len(match.group(1).expandtabs(4)) if match else 0
+        heading = match and _BOLD_LINE.match(line) and not _clean(line).endswith("?")
+        if match and not heading and _clean(match.group(3)) and (base_indent is None or indent <= base_indent):
+            base_indent = indent if base_indent is None else base_indent
+            items.append((_clean(match.group(3)), []))
+        elif items and line.strip():
+            items[-1][1].append(line)
+
+    prefix = _ID_PREFIXES.get(source, source[:1].upper())
+    questions = []
+    for index, (text, detail) in enumerate(items, start=1):
+        quoted = _QUOTED_PHRASE.search("\n".join([text, *detail]))
+        questions.append(Question(
+            id=f"{prefix}{index}",
+            text=text,
+            source=source,
+            doc_ref=quoted.group(1).strip() if quoted else "",
+        ))
+    return questions
+
+
+def normalize_for_matching(text: str) -> str:
+    """공백·문장부호를 지운 소문자 문자열 (근사 비교용)."""
+    return re.sub(r"[\W_]+", "", text.lower())
+
+
+def char_shingles(text: str, size: int = _SHINGLE_SIZE) -> set[str]:
+    normalized = normalize_for_matching(text)
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def quoted_phrases(text: str) -> list[str]:
+    """본문에서 따옴표로 인용된 문구 목록 (보고서가 서류를 인용한 부분)."""
+    return [match.group(1).strip() for match in _QUOTED_PHRASE.finditer(text or "")]
+
+
+def minhash_signature(text: str) -> tuple[int, ...]:
+    """문자 n-gram 집합의 MinHash 서명. 두 서명의 일치 비율이 Jaccard 유사도의 추정치다."""
+    hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in char_shingles(text)]
+    if not hashes:
+        return (_MERSENNE_PRIME,) * _NUM_PERM
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def estimate_similarity(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def _question_body(text: str) -> str:
+    """질문에서 마지막 서술어("무엇이었나요?", "말해주세요" 등)를 뺀 본문. 세 어절 미만이면 그대로."""
+    words = text.split()
+    return " ".join(words[:-1]) if len(words) >= 3 else text
+
+
+def dedupe_questions(questions: list[Question], threshold: float = DUPLICATE_THRESHOLD) -> list[Question]:
+    """근사 중복 질문을 하나로 합친다. 먼저 나온 질문(초기 보고서 우선)을 남긴다.
+
+    인용한 서류 문구(doc_ref)가 서로 다른 질문은 근거가 다르므로 합치지 않는다.
+    질문은 보고서당 수십 개 수준이라 LSH 버킷 없이 서명끼리 전수 비교한다.
+    """
+    kept: list[tuple[Question, tuple[int, ...]]] = []
+    for question in questions:
+        signature = minhash_signature(_question_body(question.text))
+        if any(
+            estimate_similarity(signature, other_signature) >= threshold
+            and not (question.doc_ref and other.doc_ref and question.doc_ref != other.doc_ref)
+            for other, other_signature in kept
+        ):
+            continue
+        kept.append((question, signature))
+    return [question for question, _ in kept]
+
+
+def collect_questions(initial_report: str, additional_report: str = "") -> list[Question]:
+    """초기 보고서의 대표 질문 + 추가 질문을 파싱하고 중복을 제거한 질문 목록.
+
+    초기 보고서는 질문 섹션 마커가 있을 때만 질문을 뽑는다 (question_section).
+    """
+    questions = parse_question_list(question_section(initial_report), SOURCE_INITIAL)
+    questions += parse_question_list(additional_report, SOURCE_ADDITIONAL)
+    return dedupe_questions(questions)
+
+
+def format_questions_context(initial_report: str, additional_report: str = "") -> str:
+    """프롬프트에 넣을 질문 목록 — 중복 제거된 압축 목록 + 질문을 파싱하지 못한 보고서의 원문.
+
+    원문 대체는 보고서마다 따로 한다: 한쪽 보고서만 형식이 달라도 그 보고서의 질문이
+    목록에서 조용히 빠지지 않는다. 초기 보고서는 마커 이후의 질문 섹션만 대상이다.
+    """
+    initial_section = question_section(initial_report)
+    initial = parse_question_list(initial_section, SOURCE_INITIAL)
+    additional = parse_question_list(additional_report, SOURCE_ADDITIONAL)
+    blocks = [format_question_list(dedupe_questions(initial + additional))]
+    if initial_section and not initial:
+        blocks.append(initial_section)
+    if additional_report.strip() and not additional:
+        blocks.append(additional_report.strip())
+    return "\n\n---\n\n".join(block for block in blocks if block)
+
+
+def format_question_list(questions: list[Question]) -> str:
+    """프롬프트에 넣을 압축된 질문 목록 ("[I1] 질문 (근거: '문구')" 형식, 한 줄에 하나)."""
+    lines = []
+    for question in questions:
+        line = f"[{question.id}] {question.text}"
+        if question.doc_ref and question.doc_ref not in question.text:
+            line += f" (근거: '{question.doc_ref}')"
+        lines.append(line)
+    return "\n".join(lines)
@@ -1,23 +1,225 @@
-"""PDF 텍스트 추출 (pypdf)."""
+"""PDF 텍스트 추출 — 교체 가능한 추출 백엔드 (기본 pypdf).
+
+pypdf 외에 pypdfium2(빠름)나 pdfminer.six(레이아웃 분석 — 나이스 표 출력이 깔끔함)가
+설치되어 있으면 쓸 수 있다. requirements.txt에는 넣지 않는 선택 의존성이다.
+
+어떤 백엔드를 쓸지는 select_backend()가 정한다:
+- PDF_CALIBRATION_DIR에 샘플 PDF가 있으면 calibrate()로 설치된 백엔드를 모두 돌려,
+  pypdf 결과 대비 품질 기준을 통과한 것 중 가장 빠른 백엔드를 고른다.
+- 샘플이 없으면 설치된 것 중 _DEFAULT_PREFERENCE 순서로 고른다.
+"""
+import importlib.util
+import io
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
 from pypdf import PdfReader
 
+from core.config import PDF_CALIBRATION_DIR
+
+# PdfExtraction.error 값
+ENCRYPTED = "encrypted"    # 빈 비밀번호로도 열리지 않는 암호화 PDF
+NO_TEXT = "no_text"        # 텍스트 레이어가 없음 (스캔/이미지형)
+UNREADABLE = "unreadable"  # 손상되었거나 PDF가 아님
+
+DEFAULT_BACKEND = "pypdf"
+# 보정 샘플이 없을 때의 선택 순서 (설치된 것 중 앞에서부터)
+_DEFAULT_PREFERENCE = ("pypdfium2", DEFAULT_BACKEND)
+
+# 보정 품질 기준: pypdf 결과 대비 글자 수 비율 허용 범위, 정상 문자 비율 하한
+_LENGTH_RATIO_RANGE = (0.8, 1.25)
+_MIN_CLEAN_RATIO = 0.95
+
+# PDFium(pypdfium2)은 스레드 안전하지 않아 프로세스 전체에서 호출을 직렬화한다
+_PDFIUM_LOCK = threading.Lock()
+
+
+class _EncryptedPdf(Exception):
+    """빈 비밀번호로 열 수 없는 PDF (백엔드 공통 신호)."""
+
+
+@dataclass(frozen=True)
+class PdfExtraction:
+    text: str | None          # None이면 추출 실패 (error에 원인)
+    pages: int = 0
+    error: str | None = None
+    backend: str = DEFAULT_BACKEND
+    seconds: float = 0.0      # 추출에 걸린 시간
+
+
+@dataclass(frozen=True)
+class Calibration:
+    backend: str                                              # 선택된 백엔드
+    seconds: dict[str, float] = field(default_factory=dict)   # 백엔드별 샘플 전체 추출 시간
+    rejected: dict[str, str] = field(default_factory=dict)    # 품질 미달/오류로 제외된 백엔드와 사유
+
+
+# --- 백엔드: PDF bytes → 쪽별 텍스트 목록 ---
+
+def _pypdf_pages(data: bytes) -> list[str]:
+    reader = PdfReader(io.BytesIO(data))
+    if reader.is_encrypted and not reader.decrypt(""):
+        raise _EncryptedPdf()
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+def _pypdfium2_pages(data: bytes) -> list[str]:
+    import pypdfium2 as pdfium
+
+    # 추출 워커·보정 작업이 동시에 불러도 열기부터 닫기까지 한 번에 하나씩만 돈다.
+    # 쪽/텍스트 객체도 GC(잠금 밖)에 맡기지 않고 잠금 안에서 닫는다.
+    with _PDFIUM_LOCK:
+        try:
+            document = pdfium.PdfDocument(data, password="")
+        except pdfium.PdfiumError as exc:
+            if "password" in str(exc).lower():
+                raise _EncryptedPdf() from exc
+            raise
+        try:
+            pages = []
+            for page in document:
+                textpage = page.get_textpage()
+                pages.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+            return pages
+        finally:
+            document.close()
+
+
+def _pdfminer_pages(data: bytes) -> list[str]:
+    from pdfminer.high_level import extract_text as pdfminer_extract_text
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfdocument import PDFPasswordIncorrect
+
+    try:
+        text = pdfminer_extract_text(io.BytesIO(data), password="", laparams=LAParams())
+    except PDFPasswordIncorrect as exc:
+        raise _EncryptedPdf() from exc
+    # pdfminer는 쪽 사이에 form feed를 넣는다 (마지막 쪽 뒤에도 하나)
+    return text.split("\f")[:-1] if text.endswith("\f") else text.split("\f")
+
+
+_BACKENDS: dict[str, Callable[[bytes], list[str]]] = {
+    "pypdf": _pypdf_pages,
+    "pypdfium2": _pypdfium2_pages,
+    "pdfminer": _pdfminer_pages,
+}
+_BACKEND_MODULES = {"pypdf": "pypdf", "pypdfium2": "pypdfium2", "pdfminer": "pdfminer"}
+
+
+def available_backends() -> list[str]:
+    return [name for name in _BACKENDS if importlib.util.find_spec(_BACKEND_MODULES[name]) is not None]
+
+
+# --- 추출 ---
+
+def _read_bytes(pdf_file) -> bytes:
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return bytes(pdf_file)
+    if hasattr(pdf_file, "getvalue"):
+        return pdf_file.getvalue()
+    return pdf_file.read()
+
+
+def _run_backend(name: str, data: bytes) -> PdfExtraction:
+    started = time.perf_counter()
+    try:
+        pages = _BACKENDS[name](data)
+    except _EncryptedPdf:
+        return PdfExtraction(text=None, error=ENCRYPTED, backend=name, seconds=time.perf_counter() - started)
+    except Exception:
+        return PdfExtraction(text=None, error=UNREADABLE, backend=name, seconds=time.perf_counter() - started)
+    seconds = time.perf_counter() - started
+    text = "\n".join(pages).strip()
+    if not text:
+        return PdfExtraction(text=None, pages=len(pages), error=NO_TEXT, backend=name, seconds=seconds)
+    return PdfExtraction(text=text, pages=len(pages), backend=name, seconds=seconds)
+
+
+def extract_pdf(pdf_file, backend: str = DEFAULT_BACKEND) -> PdfExtraction:
+    """업로드된 PDF에서 텍스트와 쪽수를 추출한다. 실패해도 예외 대신 원인을 담아 반환한다.
+
+    스캔(이미지)형 PDF는 텍스트가 없어 NO_TEXT가 된다.
+    나이스(NEIS) 발급본 등 빈 비밀번호로 열리는 암호화 PDF는 자동으로 해제를 시도한다.
+    선택 백엔드가 파일을 읽지 못하면 pypdf로 한 번 더 시도한다.
+    """
+    try:
+        data = _read_bytes(pdf_file)
+    except Exception:
+        return PdfExtraction(text=None, error=UNREADABLE, backend=backend)
+    result = _run_backend(backend, data)
+    if result.error == UNREADABLE and backend != DEFAULT_BACKEND:
+        result = _run_backend(DEFAULT_BACKEND, data)
+    return result
+
 
 def extract_text(pdf_file) -> str | None:
     """업로드된 PDF에서 텍스트를 추출한다.
 
     반환값이 None이면 호출부에서 사용자에게 원인(암호화/스캔본 등)을 안내해야 한다.
-    스캔(이미지)형 PDF는 텍스트가 없어 빈 결과가 나온다.
-    나이스(NEIS) 발급본 등 빈 비밀번호로 열리는 암호화 PDF는 자동으로 해제를 시도한다.
+    원인까지 필요하면 extract_pdf를 쓴다.
     """
     if pdf_file is None:
         return None
-    try:
-        reader = PdfReader(pdf_file)
-        if reader.is_encrypted:
-            if not reader.decrypt(""):
-                return None
-        text = "\n".join(page.extract_text() or "" for page in reader.pages)
-    except Exception:
-        return None
-    text = text.strip()
-    return text or None
+    return extract_pdf(pdf_file).text
+
+
+# --- 백엔드 보정 ---
+
+def _clean_ratio(text: str) -> float:
+    """정상 문자(한글/영숫자/공백/문장부호) 비율. 깨진 글리프(cid, 사설 영역, U+FFFD)가 많으면 낮아진다."""
+    if not text:
+        return 0.0
+    bad = sum(1 for ch in text if ch == "�" or unicodedata.category(ch) in ("Co", "Cn", "Cc") and ch not in "\n\r\t")
+    return 1 - bad / len(text)
+
+
+def _quality_problem(result: PdfExtraction, baseline: PdfExtraction) -> str | None:
+    if baseline.text is None:
+        return None  # 기준(pypdf)도 못 읽은 샘플은 비교하지 않는다
+    if result.text is None:
+        return f"텍스트 추출 실패 ({result.error})"
+    ratio = len(result.text) / len(baseline.text)
+    low, high = _LENGTH_RATIO_RANGE
+    if not low <= ratio <= high:
+        return f"글자 수가 pypdf 대비 {ratio:.2f}배"
+    if _clean_ratio(result.text) < _MIN_CLEAN_RATIO:
+        return "깨진 문자 비율이 높음"
+    return None
+
+
+def calibrate(samples: list[bytes], backends: list[str] | None = None) -> Calibration:
+    """샘플 PDF 전체를 각 백엔드로 추출해, 품질 기준을 통과한 것 중 가장 빠른 백엔드를 고른다.
+
+    품질 기준은 pypdf 결과와 비교한다 (pypdf는 항상 합격 — 기준 자체이므로).
+    """
+    backends = backends if backends is not None else available_backends()
+    baselines = [_run_backend(DEFAULT_BACKEND, data) for data in samples]
+    seconds = {DEFAULT_BACKEND: sum(result.seconds for result in baselines)}
+    rejected = {}
+    for name in backends:
+        if name == DEFAULT_BACKEND:
+            continue
+        results = [_run_backend(name, data) for data in samples]
+        problem = next(
+            (p for result, base in zip(results, baselines) if (p := _quality_problem(result, base))), None,
+        )
+        if problem:
+            rejected[name] = problem
+        else:
+            seconds[name] = sum(result.seconds for result in results)
+    return Calibration(backend=min(seconds, key=seconds.get), seconds=seconds, rejected=rejected)
+
+
+def select_backend(sample_dir: str = PDF_CALIBRATION_DIR) -> Calibration:
+    """이 서버에서 쓸 추출 백엔드. 샘플 PDF가 있으면 보정 결과, 없으면 기본 선호 순서."""
+    samples = [path.read_bytes() for path in sorted(Path(sample_dir).glob("*.pdf"))]
+    installed = available_backends()
+    if samples:
+        return calibrate(samples, installed)
+    return Calibration(backend=next(name for name in _DEFAULT_PREFERENCE if name in installed))
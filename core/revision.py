@@ -0,0 +1,135 @@
+"""서류 수정본 비교: 문단/섹션 단위 diff와 영향받는 보고서·질문 판정.
+
+자기소개서를 조금 고쳐 다시 올릴 때마다 모든 보고서를 Pro로 새로 만들지 않도록,
+이전 추출 텍스트와 새 텍스트를 문단 단위로 비교해 바뀐 부분을 인용하는 보고서와
+질문만 골라낸다.
+
+판정 기준 — 보고서/질문이 바뀐 문단을 '참조한다'고 보는 경우:
+- 보고서가 따옴표로 인용한 문구가 삭제·수정 전 문단 안에 있다.
+- 보고서와 삭제·수정 전 문단이 공백/문장부호를 뺀 12자 이상을 그대로 공유한다.
+순수하게 추가된 문단은 새 질문거리이므로 질문을 만드는 보고서는 모두 갱신 대상이 된다.
+"""
+import difflib
+import re
+from dataclasses import dataclass, field
+
+from core.parsing import Question, char_shingles, normalize_for_matching, quoted_phrases
+
+# 보고서가 서류를 '그대로 옮겨 적었다'고 보는 최소 연속 일치 길이 (정규화 후 글자 수)
+_VERBATIM_CHARS = 12
+# 인용 문구로 인정하는 최소 길이 (정규화 후) — 너무 짧은 인용은 우연히 겹친다
+_MIN_QUOTE_CHARS = 4
+# 섹션 제목으로 보는 줄: "1. 지원 동기", "[창의적 체험활동]", "■ 세부능력", "<수학>", "① …"
+_SECTION_HEADING = re.compile(r"^\s*(?:\d{1,2}[.)]\s*\S|\[[^\]]{1,30}\]|[■□◆◇●○▶]\s*\S|<[^>]{1,30}>|[①-⑳]\s*\S)")
+_DIFF_PREVIEW_CHARS = 400
+
+
+@dataclass(frozen=True)
+class DocDiff:
+    label: str                                      # "생활기록부" / "자기소개서"
+    removed: list[str] = field(default_factory=list)   # 삭제·수정 전 문단 (이전 버전)
+    added: list[str] = field(default_factory=list)     # 추가·수정 후 문단 (새 버전)
+    inserted: list[str] = field(default_factory=list)  # added 중 기존 문단을 대체하지 않은 순수 추가분
+    sections: list[str] = field(default_factory=list)  # 변경이 일어난 섹션 제목
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.removed or self.added)
+
+
+def split_paragraphs(text: str) -> list[str]:
+    """빈 줄 기준 문단. PDF 추출 결과에 빈 줄이 없으면 줄 단위로 나눈다."""
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text or "") if p.strip()]
+    if len(paragraphs) <= 1:
+        paragraphs = [line.strip() for line in (text or "").splitlines() if line.strip()]
+    return paragraphs
+
+
+def _section_of(paragraphs: list[str]) -> list[str]:
+    """각 문단이 속한 섹션 제목 (앞쪽에서 마지막으로 나온 제목 줄)."""
+    current = ""
+    sections = []
+    for paragraph in paragraphs:
+        first_line = paragraph.splitlines()[0]
+        if _SECTION_HEADING.match(first_line):
+            current = first_line.strip()[:40]
+        sections.append(current)
+    return sections
+
+
+def diff_document(label: str, old_text: str, new_text: str) -> DocDiff:
+    old, new = split_paragraphs(old_text), split_paragraphs(new_text)
+    # 공백만 바뀐 문단은 같은 문단으로 본다 (PDF 재추출 시 줄바꿈이 흔들린다)
+    matcher = difflib.SequenceMatcher(
+        a=[normalize_for_matching(p) for p in old],
+        b=[normalize_for_matching(p) for p in new],
+        autojunk=False,
+    )
+    new_sections = _section_of(new)
+    old_sections = _section_of(old)
+    removed, added, inserted, sections = [], [], [], []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        removed += old[i1:i2]
+        added += new[j1:j2]
+        if tag == "insert":
+            inserted += new[j1:j2]
+        for section in old_sections[i1:i2] + new_sections[j1:j2]:
+            if section and section not in sections:
+                sections.append(section)
+    return DocDiff(label=label, removed=removed, added=added, inserted=inserted, sections=sections)
+
+
+def _references(text: str, paragraphs: list[str]) -> bool:
+    if not text or not paragraphs:
+        return False
+    normalized = [normalize_for_matching(p) for p in paragraphs]
+    for phrase in quoted_phrases(text):
+        phrase = normalize_for_matching(phrase)
+        if len(phrase) >= _MIN_QUOTE_CHARS and any(phrase in p for p in normalized):
+            return True
+    text_grams = char_shingles(text, _VERBATIM_CHARS)
+    return any(char_shingles(p, _VERBATIM_CHARS) & text_grams for p in paragraphs if len(p) >= _VERBATIM_CHARS)
+
+
+def report_affected(report: str, diffs: list[DocDiff], generates_questions: bool) -> bool:
+    """보고서를 갱신해야 하는지. 질문을 만드는 보고서는 순수 추가 문단에도 반응한다."""
+    if not report:
+        return False
+    removed = [p for diff in diffs for p in diff.removed]
+    if _references(report, removed):
+        return True
+    return generates_questions and any(diff.inserted for diff in diffs)
+
+
+def affected_questions(questions: list[Question], diffs: list[DocDiff]) -> list[Question]:
+    """삭제·수정된 문단을 근거로 삼은 질문들."""
+    removed = [p for diff in diffs for p in diff.removed]
+    affected = []
+    for question in questions:
+        quoted = f"'{question.doc_ref}'" if question.doc_ref else ""
+        if _references(f"{question.text} {quoted}", removed):
+            affected.append(question)
+    return affected
+
+
+def _preview(paragraph: str) -> str:
+    if len(paragraph) <= _DIFF_PREVIEW_CHARS:
+        return paragraph
+    return paragraph[:_DIFF_PREVIEW_CHARS] + " …"
+
+
+def format_diff(diffs: list[DocDiff]) -> str:
+    """프롬프트/화면용 변경 요약 ("- 이전" / "+ 수정본" 문단 목록)."""
+    blocks = []
+    for diff in diffs:
+        if not diff.changed:
+            continue
+        lines = [f"[{diff.label}]"]
+        if diff.sections:
+            lines.append(f"변경된 섹션: {', '.join(diff.sections)}")
+        lines += [f"- {_preview(p)}" for p in diff.removed]
+        lines += [f"+ {_preview(p)}" for p in diff.added]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
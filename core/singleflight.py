@@ -0,0 +1,77 @@
+"""동일 요청 합치기(single-flight): 같은 키로 동시에 들어온 호출은 한 번만 실행한다.
+
+더블 클릭, 스피너 도중의 Streamlit rerun, 같은 서류를 연 여러 탭이 똑같은
+Pro 호출(1~2분)을 병렬로 보내는 것을 막는다. 먼저 도착한 호출(leader)만 실제로
+실행하고, 나머지는 그 결과나 예외를 그대로 공유받는다.
+
+leader가 Exception이 아닌 BaseException(Streamlit의 StopException/RerunException,
+세션 종료 등)으로 중단되면 결과가 없으므로, 기다리던 호출 중 하나가 새 leader가
+되어 다시 실행한다 — 대기자가 영원히 멈추거나 엉뚱한 중단 신호를 받지 않는다.
+"""
+import threading
+from typing import Any, Callable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Exception | None = None
+        self.abandoned = False
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._issued = 0
+        self._coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """key로 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 fn()을 직접 실행한다."""
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                    self._issued += 1
+                else:
+                    call.waiters += 1
+            if leader:
+                return self._lead(key, call, fn)
+
+            call.done.wait()
+            if call.abandoned:
+                continue  # leader가 중단됨 — 새 leader를 정해 다시 실행
+            with self._lock:
+                self._coalesced += 1
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+    def _lead(self, key: str, call: _Call, fn: Callable[[], Any]) -> Any:
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as exc:
+            call.error = exc
+            raise
+        except BaseException:
+            call.abandoned = True
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict[str, int]:
+        """실제로 실행된 호출 수(issued)와 다른 호출의 결과를 공유받은 수(coalesced)."""
+        with self._lock:
+            return {
+                "issued": self._issued,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls),
+            }
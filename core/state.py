@@ -3,8 +3,12 @@
 기본값은 호출 시마다 새로 만든다 — 모듈 전역의 가변 객체(list 등)를 setdefault로
 넣으면 Streamlit 프로세스 안에서 세션 간에 같은 객체가 공유될 수 있다.
 """
+import uuid
+
 import streamlit as st
 
+from core.jobs import get_extraction_runner, get_job_runner
+
 
 def _defaults() -> dict:
     return {
@@ -18,9 +22,17 @@ def _defaults() -> dict:
         "model_answers": "",
         "messages": [],            # 진행 중인 시뮬레이션의 대화 (role/content dict)
         "simulation_history": [],  # 완료된 시뮬레이션 [{transcript, report}]
+        "revisions": [],           # 서류 수정본 반영 전 스냅샷 [{life_record, cover_letter, 보고서들, diff}]
+        "revision_pending": None,  # 진행 중인 수정본 반영 {수정본 텍스트, diff, 갱신 대상 keys, results, failed}
         "chat": None,              # google-genai 채팅 세션 (유실 시 messages로 재구성)
         "sim_start_prompt": "",    # 채팅 세션 재구성에 필요한 시작 명령어
         "sim_context": "",         # 채팅 세션 재구성에 필요한 사전 분석 자료
+        "sim_cache": None,         # 시뮬레이션 explicit cache {name, expires_at} (core/caching.py 정책)
+        "sim_turn_times": [],      # 턴 시각 기록 — 캐시 정책의 호출 수 예측용
+        "session_id": uuid.uuid4().hex,  # 작업 실행기의 세션 간 공정성 기준
+        "jobs": {},                # 진행 중인 백그라운드 작업 {결과를 넣을 state 키: job id}
+        "extractions": {},         # 업로드 즉시 시작한 PDF 추출 {업로더 키: {file_id, job_id}}
+        "extraction_log": [],      # 업로드별 추출 기록 [{document, backend, seconds, pages, chars, error}]
     }
 
 
@@ -31,6 +43,8 @@ def init_session_state() -> None:
 
 
 def reset_analysis_state() -> None:
-    """'새로운 분석 시작하기' — 모든 분석/시뮬레이션 상태를 비운다."""
+    """'새로운 분석 시작하기' — 모든 분석/시뮬레이션 상태를 비운다 (대기 중인 작업은 취소, 끝난 작업의 결과도 삭제)."""
+    get_job_runner().discard_session(st.session_state.session_id)
+    get_extraction_runner().discard_session(st.session_state.session_id)
     for key in list(_defaults()):
         st.session_state.pop(key, None)
@@ -0,0 +1,49 @@
+"""시뮬레이션 explicit cache 비용 모델/정책."""
+from core import caching
+from core.caching import CREATE, DELETE, KEEP, NONE, REFRESH, decide_cache_action, expected_savings, predict_calls
+from core.config import SIM_CACHE_MIN_TOKENS, SIM_CACHE_TTL_SECONDS, SIM_DEFAULT_TURN_SECONDS, SIM_EXPECTED_TURNS
+
+BIG_PREFIX = 40_000
+
+
+def test_predict_calls_uses_recent_turn_interval():
+    # 30초 간격으로 답하는 학생 → TTL 600초 동안 20턴 가능하지만 남은 턴 수가 상한
+    turn_times = [i * 30.0 for i in range(5)]
+    assert predict_calls(turn_times, ttl_seconds=600) == min(SIM_EXPECTED_TURNS - 5, 600 / 30)
+
+
+def test_predict_calls_defaults_and_lindy_floor():
+    assert predict_calls([], ttl_seconds=600) == 600 / SIM_DEFAULT_TURN_SECONDS
+    long_session = [i * 600.0 for i in range(40)]
+    # 사전값을 넘긴 면접도 남은 턴을 0으로 보지 않는다
+    assert predict_calls(long_session, ttl_seconds=600) == 1.0
+
+
+def test_savings_sign_depends_on_call_volume():
+    assert expected_savings(BIG_PREFIX, calls=10) > 0
+    assert expected_savings(BIG_PREFIX, calls=0) < 0
+
+
+def test_no_cache_below_minimum_size():
+    assert decide_cache_action(None, SIM_CACHE_MIN_TOKENS - 1, [], now=0) == NONE
+
+
+def test_create_keep_refresh_lifecycle():
+    turn_times = [0.0, 30.0, 60.0]
+    assert decide_cache_action(None, BIG_PREFIX, turn_times, now=60) == CREATE
+
+    cache = {"name": "c", "expires_at": 60 + SIM_CACHE_TTL_SECONDS}
+    assert decide_cache_action(cache, BIG_PREFIX, turn_times, now=90) == KEEP
+    assert decide_cache_action(cache, BIG_PREFIX, turn_times, now=60 + SIM_CACHE_TTL_SECONDS - 10) == REFRESH
+
+
+def test_expired_cache_is_treated_as_missing():
+    cache = {"name": "c", "expires_at": 100}
+    assert decide_cache_action(cache, BIG_PREFIX, [0.0, 30.0], now=100) == CREATE
+    assert decide_cache_action(cache, SIM_CACHE_MIN_TOKENS - 1, [0.0, 30.0], now=100) == NONE
+
+
+def test_delete_when_no_longer_worthwhile(monkeypatch):
+    monkeypatch.setattr(caching, "predict_calls", lambda turn_times, ttl_seconds: 0.0)
+    cache = {"name": "c", "expires_at": 1_000}
+    assert decide_cache_action(cache, BIG_PREFIX, [0.0], now=10) == DELETE
@@ -56,3 +56,163 @@ def test_empty_response_retries_then_raises():
             life_record="lr", cover_letter="cl", command="go",
         )
     assert client.models.calls == 3
+
+
+# --- 공통 앞부분 (implicit caching) ---
+
+class _RecordingModels:
+    def __init__(self):
+        self.requests = []
+
+    def generate_content(self, **kwargs):
+        self.requests.append(kwargs)
+        usage = SimpleNamespace(prompt_token_count=100, cached_content_token_count=80)
+        return SimpleNamespace(text="응답", usage_metadata=usage)
+
+
+class _RecordingChats:
+    def __init__(self):
+        self.created = []
+
+    def create(self, **kwargs):
+        self.created.append(kwargs)
+        chat = SimpleNamespace(sent=[])
+        chat.send_message = lambda message: chat.sent.append(message) or SimpleNamespace(
+            text="첫 질문", usage_metadata=None,
+        )
+        return chat
+
+
+def _prefix_bytes(contents, length=2):
+    return [content.model_dump_json(exclude_none=True).encode("utf-8") for content in contents[:length]]
+
+
+def test_prefix_identical_across_reports_and_chat():
+    from ui.analysis import CMD_ADDITIONAL, CMD_INITIAL, CMD_MODEL_ANSWERS, CMD_STRATEGY
+    from ui.simulation import CMD_FINAL_REPORT
+
+    client = SimpleNamespace(models=_RecordingModels(), chats=_RecordingChats())
+    docs = dict(life_record="생기부 원문", cover_letter="자소서 원문")
+    expected = _prefix_bytes(gemini.build_prefix(**docs))
+
+    commands = [
+        (CMD_INITIAL, None),
+        (CMD_ADDITIONAL, None),
+        (CMD_STRATEGY, None),
+        (CMD_MODEL_ANSWERS, "[답변해야 할 질문 목록]\n[I1] 질문"),
+        (CMD_FINAL_REPORT, "[면접 전체 대화 기록]\n면접관: 질문"),
+    ]
+    for command, extra in commands:
+        gemini.generate_report(client=client, model="pro", system_prompt="s", command=command, extra_context=extra, **docs)
+    for request in client.models.requests:
+        assert request["config"].system_instruction == "s"
+        assert _prefix_bytes(request["contents"]) == expected
+
+    chat, first = gemini.open_interview(client, "flash", "s", context_reports="분석", start_prompt="시작", **docs)
+    gemini.create_interview_chat(
+        client, "flash", "s", context_reports="분석", start_prompt="시작",
+        prior_messages=[{"role": "assistant", "content": first}], **docs,
+    )
+    fresh, rebuilt = client.chats.created
+    assert fresh["config"].system_instruction == "s"
+    assert _prefix_bytes(fresh["history"]) == expected
+    assert _prefix_bytes(rebuilt["history"]) == expected
+    # 재구성된 세션의 첫 user 턴은 새 면접에서 보낸 메시지와 같아야 한다.
+    assert chat.sent == [gemini.interview_opening("분석", "시작")]
+    assert rebuilt["history"][2].parts[0].text == chat.sent[0]
+
+
+def test_cache_usage_is_aggregated_from_usage_metadata():
+    usage = gemini._CacheUsage()
+    usage.record("pro", SimpleNamespace(prompt_token_count=100, cached_content_token_count=75))
+    usage.record("pro", SimpleNamespace(prompt_token_count=100, cached_content_token_count=None))
+    usage.record("pro", None)
+    assert usage.stats() == {"pro": {"prompt_tokens": 200, "cached_tokens": 75, "hit_ratio": 0.375}}
+
+
+def test_cached_chat_sends_only_turns_after_cached_part():
+    client = SimpleNamespace(chats=_RecordingChats())
+    messages = [
+        {"role": "assistant", "content": "첫 질문"},
+        {"role": "user", "content": "답변"},
+        {"role": "assistant", "content": "꼬리 질문"},
+    ]
+    gemini.create_interview_chat(
+        client, "flash", "s", "생기부", "자소서",
+        context_reports="분석", prior_messages=messages, start_prompt="시작", cached_content="cachedContents/1",
+    )
+    created = client.chats.created[0]
+    assert created["config"].cached_content == "cachedContents/1"
+    assert created["config"].system_instruction is None
+    assert [c.parts[0].text for c in created["history"]] == ["답변", "꼬리 질문"]
+
+
+def test_is_cache_missing():
+    assert gemini.is_cache_missing(errors.APIError(404, {"error": {"message": "CachedContent not found"}}))
+    assert not gemini.is_cache_missing(errors.APIError(404, {"error": {"message": "model not found"}}))
+    assert not gemini.is_cache_missing(errors.APIError(503, {"error": {"message": "cache busy"}}))
+
+
+# --- 스트리밍 턴 이어 받기 ---
+
+class _FlakyChat:
+    """청크 몇 개를 보낸 뒤 예외로 끊기는 스트림을 돌려주는 가짜 채팅 세션."""
+
+    def __init__(self, chunks, exc):
+        self._chunks, self._exc = chunks, exc
+        self.recorded = []
+
+    def get_history(self, curated=False):
+        return [gemini._user("이전 질문")]
+
+    def send_message_stream(self, message):
+        for text in self._chunks:
+            yield SimpleNamespace(text=text, usage_metadata=None)
+        raise self._exc
+
+    def record_history(self, user_input, model_output, is_valid):
+        self.recorded.append((user_input, model_output, is_valid))
+
+
+class _StreamingModels:
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.requests = []
+
+    def generate_content_stream(self, **kwargs):
+        self.requests.append(kwargs)
+        return iter(SimpleNamespace(text=text, usage_metadata=None) for text in self._chunks)
+
+
+def test_interrupted_stream_resumes_from_partial_reply():
+    chat = _FlakyChat(["그렇다면 ", "그 실험"], errors.APIError(503, {}))
+    client = SimpleNamespace(models=_StreamingModels(["에서 ", "무엇을 배웠나요?"]))
+    recoveries = []
+    config = gemini.interview_config("s")
+    with patch("core.gemini.time.sleep"):
+        chunks = list(gemini.stream_chat_reply(chat, "답변", "flash", client, config, on_recover=recoveries.append))
+
+    assert "".join(chunks) == "그렇다면 그 실험에서 무엇을 배웠나요?"
+    request = client.models.requests[0]
+    assert request["config"] is config
+    assert [(c.role, c.parts[0].text) for c in request["contents"]] == [
+        ("user", "이전 질문"),
+        ("user", "답변"),
+        ("model", "그렇다면 그 실험"),
+        ("user", gemini._CONTINUE_PROMPT),
+    ]
+    # 이어 붙인 전체 답변이 한 턴으로 기록된다.
+    (user_input, model_output, is_valid), = chat.recorded
+    assert user_input.parts[0].text == "답변"
+    assert model_output[0].parts[0].text == "그렇다면 그 실험에서 무엇을 배웠나요?"
+    assert is_valid
+    assert len(recoveries) == 1 and recoveries[0] >= 0
+
+
+def test_non_transient_stream_error_is_not_resumed():
+    chat = _FlakyChat(["부분"], errors.APIError(400, {}))
+    client = SimpleNamespace(models=_StreamingModels(["unreachable"]))
+    with patch("core.gemini.time.sleep"), pytest.raises(errors.APIError):
+        list(gemini.stream_chat_reply(chat, "답변", "flash", client))
+    assert client.models.requests == []
+    assert chat.recorded == []
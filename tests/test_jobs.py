@@ -0,0 +1,197 @@
+"""JobRunner 스케줄링 (우선순위, 세션 공정성, 채팅 전용 슬롯, 취소, 스트리밍)."""
+import threading
+import time
+
+import pytest
+
+from core.jobs import (
+    CANCELLED,
+    DONE,
+    FAILED,
+    PRIORITY_CHAT,
+    PRIORITY_INITIAL,
+    PRIORITY_REPORT,
+    JobCancelledError,
+    JobRunner,
+)
+
+
+def _blocker(runner, session="blocker", priority=PRIORITY_REPORT):
+    """워커 하나를 붙잡아 두는 작업. 반환된 Event를 set하면 끝난다."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def fn(job):
+        started.set()
+        release.wait(5)
+
+    runner.submit(session, priority, fn)
+    assert started.wait(5)
+    return release
+
+
+def test_priority_then_session_fairness_then_fifo():
+    runner = JobRunner(max_workers=1, reserved_interactive=0)
+    release = _blocker(runner, session="a")
+    order = []
+    record = lambda name: (lambda job: order.append(name))  # noqa: E731
+
+    jobs = [
+        runner.submit("a", PRIORITY_REPORT, record("a-report")),
+        runner.submit("b", PRIORITY_REPORT, record("b-report")),
+        runner.submit("c", PRIORITY_INITIAL, record("c-initial")),
+        runner.submit("d", PRIORITY_CHAT, record("d-chat")),
+    ]
+    # 세션 a는 방금 작업을 시작했으므로 같은 클래스의 b가 먼저다.
+    assert [runner.queue_position(job.id) for job in jobs] == [4, 3, 2, 1]
+
+    release.set()
+    for job in jobs:
+        assert job.wait(5)
+    assert order == ["d-chat", "c-initial", "b-report", "a-report"]
+
+
+def test_reserved_slot_keeps_chat_responsive():
+    runner = JobRunner(max_workers=2, reserved_interactive=1)
+    release = _blocker(runner)
+    queued_report = runner.submit("x", PRIORITY_REPORT, lambda job: "report")
+    chat = runner.submit("y", PRIORITY_CHAT, lambda job: "reply")
+
+    assert chat.wait(5)
+    assert chat.status == DONE and chat.result == "reply"
+    assert not queued_report.finished  # 보고서는 채팅 전용 슬롯을 쓰지 못한다
+
+    release.set()
+    assert queued_report.wait(5)
+    assert queued_report.result == "report"
+
+
+def test_failure_is_recorded_on_job():
+    runner = JobRunner(max_workers=1, reserved_interactive=0)
+
+    def fn(job):
+        raise ValueError("boom")
+
+    job = runner.submit("s", PRIORITY_REPORT, fn)
+    assert job.wait(5)
+    assert job.status == FAILED
+    assert isinstance(job.error, ValueError)
+
+
+def test_cancel_session_drops_only_queued_jobs():
+    runner = JobRunner(max_workers=1, reserved_interactive=0)
+    release = _blocker(runner, session="s")
+    mine = runner.submit("s", PRIORITY_REPORT, lambda job: "mine")
+    other = runner.submit("t", PRIORITY_REPORT, lambda job: "other")
+
+    assert runner.cancel_session("s") == 1
+    assert mine.status == CANCELLED
+    assert isinstance(mine.error, JobCancelledError)
+
+    release.set()
+    assert other.wait(5)
+    assert other.result == "other"
+
+
+def test_stream_yields_emitted_chunks_and_reraises():
+    runner = JobRunner(max_workers=1, reserved_interactive=0)
+
+    def ok(job):
+        for chunk in ("안녕", "하세요"):
+            job.emit(chunk)
+        return "".join(job.chunks)
+
+    job = runner.submit("s", PRIORITY_CHAT, ok)
+    assert list(job.stream()) == ["안녕", "하세요"]
+    assert job.result == "안녕하세요"
+
+    def broken(job):
+        job.emit("부분")
+        raise RuntimeError("끊김")
+
+    job = runner.submit("s", PRIORITY_CHAT, broken)
+    received = []
+    with pytest.raises(RuntimeError):
+        for chunk in job.stream():
+            received.append(chunk)
+    assert received == ["부분"]
+
+
+def test_finished_job_releases_fn_and_can_be_discarded():
+    runner = JobRunner(max_workers=1, reserved_interactive=0)
+    job = runner.submit("s", PRIORITY_REPORT, lambda job: "result")
+    assert job.wait(5)
+    assert job.fn is None  # 클로저가 잡은 서류 원문을 바로 놓는다
+
+    runner.discard(job.id)
+    assert runner.get(job.id) is None
+
+
+def test_discard_session_forgets_only_that_session():
+    runner = JobRunner(max_workers=1, reserved_interactive=0)
+    mine = runner.submit("s", PRIORITY_REPORT, lambda job: "mine")
+    other = runner.submit("t", PRIORITY_REPORT, lambda job: "other")
+    assert mine.wait(5) and other.wait(5)
+
+    runner.discard_session("s")
+    assert runner.get(mine.id) is None
+    assert runner.get(other.id) is other
+
+
+def test_expired_jobs_are_pruned_without_new_submits():
+    runner = JobRunner(max_workers=1, reserved_interactive=0, retention_seconds=0.05)
+    job = runner.submit("s", PRIORITY_REPORT, lambda job: "result")
+    assert job.wait(5)
+    deadline = time.monotonic() + 5
+    while runner.get(job.id) is not None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert runner.get(job.id) is None
+
+
+def test_discard_cancels_queued_job_before_it_runs():
+    runner = JobRunner(max_workers=1, reserved_interactive=0)
+    release = _blocker(runner)
+    ran = threading.Event()
+    job = runner.submit("s", PRIORITY_REPORT, lambda job: ran.set())
+
+    runner.discard(job.id)
+    assert job.status == CANCELLED
+    release.set()
+    after = runner.submit("s", PRIORITY_REPORT, lambda job: "after")
+    assert after.wait(5)
+    assert not ran.is_set()
+
+
+def test_cancelled_revision_jobs_never_run():
+    # 수정본 반영 취소는 대기 중인 revise:* 작업마다 discard를 부른다 (ui.common.drop_job).
+    runner = JobRunner(max_workers=1, reserved_interactive=0)
+    release = _blocker(runner)
+    calls = []
+    jobs = [
+        runner.submit("s", PRIORITY_REPORT, lambda job, key=key: calls.append(key))
+        for key in ("initial_result", "premium_report", "additional_questions")
+    ]
+
+    for job in jobs:
+        runner.discard(job.id)
+    release.set()
+    after = runner.submit("s", PRIORITY_REPORT, lambda job: "after")
+
+    assert after.wait(5) and after.result == "after"
+    assert calls == []
+    assert all(job.status == CANCELLED for job in jobs)
+
+def test_base_exception_fails_job_and_worker_survives():
+    runner = JobRunner(max_workers=1, reserved_interactive=0)
+
+    def fn(job):
+        raise SystemExit()
+
+    job = runner.submit("s", PRIORITY_REPORT, fn)
+    assert job.wait(5)
+    assert job.status == FAILED
+    assert isinstance(job.error.__cause__, SystemExit)
+
+    following = runner.submit("s", PRIORITY_REPORT, lambda job: "ok")
+    assert following.wait(5)
+    assert following.result == "ok"
@@ -1,4 +1,18 @@
-from core.parsing import parse_questions_from_report
+from core.parsing import (
+    DUPLICATE_THRESHOLD,
+    SOURCE_ADDITIONAL,
+    SOURCE_INITIAL,
+    Question,
+    collect_questions,
+    dedupe_questions,
+    estimate_similarity,
+    format_question_list,
+    format_questions_context,
+    minhash_signature,
+    parse_question_list,
+    parse_questions_from_report,
+    split_report,
+)
 
 
 def test_extracts_after_primary_marker():
@@ -26,3 +40,106 @@ def test_empty_input():
 def test_marker_priority_order():
     text = "대표 질문\n낮은 우선순위\n---[대표_예상_질문_시작_마커]---\n높은 우선순위"
     assert parse_questions_from_report(text) == "높은 우선순위"
+
+
+def test_parse_question_list_records():
+    text = (
+        "1. **'로봇 동아리'에서 맡은 역할은 무엇이었나요?**\n"
+        "   - 의도: 협업 역량 확인\n"
+        "2) 세특에 적힌 “양자 터널링 탐구”의 한계는?\n"
+    )
+    questions = parse_question_list(text, SOURCE_ADDITIONAL)
+    assert [q.id for q in questions] == ["A1", "A2"]
+    assert questions[0].text == "'로봇 동아리'에서 맡은 역할은 무엇이었나요?"
+    assert questions[0].doc_ref == "로봇 동아리"
+    assert questions[1].doc_ref == "양자 터널링 탐구"
+    assert all(q.source == SOURCE_ADDITIONAL for q in questions)
+
+
+def test_parse_question_list_without_numbers_is_empty():
+    assert parse_question_list("질문 목록이 아닌 일반 문단", SOURCE_INITIAL) == []
+
+
+def test_split_report():
+    text = "분석 본문\n---[대표_예상_질문_시작_마커]---\n1. 질문"
+    assert split_report(text) == ("분석 본문", "1. 질문")
+    assert split_report("마커 없음") == ("", "마커 없음")
+
+
+def test_collect_questions_dedupes_across_reports():
+    initial = (
+        "분석\n---[대표_예상_질문_시작_마커]---\n"
+        "1. 로봇 동아리에서 맡은 역할은 무엇이었나요?\n"
+        "2. 진로를 바꾼 계기는 무엇인가요?\n"
+    )
+    additional = (
+        "1. 로봇 동아리에서 맡은 역할은 무엇이었습니까?\n"
+        "2. 수학 세특의 미분방정식 탐구에서 가장 어려웠던 점은?\n"
+    )
+    questions = collect_questions(initial, additional)
+    assert [q.id for q in questions] == ["I1", "I2", "A2"]
+
+
+def test_minhash_similarity_bounds():
+    sig = minhash_signature("진로를 바꾼 계기는 무엇인가요?")
+    assert estimate_similarity(sig, minhash_signature("진로를 바꾼 계기는 무엇인가요")) == 1.0
+    assert estimate_similarity(sig, minhash_signature("수학 세특의 미분방정식 탐구")) < DUPLICATE_THRESHOLD
+
+
+def test_format_question_list():
+    questions = [
+        Question(id="I1", text="역할은?", source=SOURCE_INITIAL, doc_ref="로봇 동아리"),
+        Question(id="A1", text="'로봇 동아리' 역할은?", source=SOURCE_ADDITIONAL, doc_ref="로봇 동아리"),
+    ]
+    assert format_question_list(questions) == "[I1] 역할은? (근거: '로봇 동아리')\n[A1] '로봇 동아리' 역할은?"
+
+
+def test_parse_question_list_ignores_heading_lines():
+    text = "### 1. 학업 역량\n1. 동아리에서 맡은 역할은?"
+    assert [q.text for q in parse_question_list(text, SOURCE_INITIAL)] == ["동아리에서 맡은 역할은?"]
+
+    text = (
+        "**1. 학업 역량 검증**\n"
+        "1. 수학 성적이 떨어진 이유는?\n"
+        "   1) 꼬리 질문: 그때 어떻게 극복했나요?\n"
+        "**2. 공동체 역량**\n"
+        "1. 학급 회장으로서 갈등을 해결한 경험은?\n"
+    )
+    questions = parse_question_list(text, SOURCE_ADDITIONAL)
+    assert [q.text for q in questions] == ["수학 성적이 떨어진 이유는?", "학급 회장으로서 갈등을 해결한 경험은?"]
+    assert [q.id for q in questions] == ["A1", "A2"]
+
+
+def test_unmarked_initial_report_yields_no_questions():
+    initial = "1. 학업 역량: 우수\n2. 공동체 역량: 보통"
+    assert collect_questions(initial) == []
+    assert format_questions_context(initial) == ""
+
+
+def test_questions_context_falls_back_per_report():
+    initial = (
+        "분석\n---[대표_예상_질문_시작_마커]---\n"
+        "1. 로봇 동아리에서 맡은 역할은 무엇이었나요?\n"
+        "2. 진로를 바꾼 계기는 무엇인가요?\n"
+    )
+    additional = "### 질문 1\n수학 세특의 미분방정식 탐구에서 가장 어려웠던 점은?\n### 질문 2\n…"
+    context = format_questions_context(initial, additional)
+    assert context.startswith("[I1] 로봇 동아리에서 맡은 역할은 무엇이었나요?\n[I2] ")
+    assert context.endswith(additional)
+
+
+def test_dedupe_keeps_same_template_different_topic():
+    questions = parse_question_list(
+        "1. 로봇 동아리에서 맡은 역할은 무엇이었나요?\n"
+        "2. 과학 동아리에서 맡은 역할은 무엇이었나요?\n"
+        "3. 자율주행 프로젝트에서 본인이 기여한 부분은 무엇인가요?\n"
+        "4. 드론 프로젝트에서 본인이 기여한 부분은 무엇인가요?\n",
+        SOURCE_ADDITIONAL,
+    )
+    assert dedupe_questions(questions) == questions
+
+
+def test_dedupe_never_merges_different_doc_refs():
+    first = Question(id="A1", text="이 활동에서 맡은 역할은?", source=SOURCE_ADDITIONAL, doc_ref="로봇 동아리")
+    second = Question(id="A2", text="이 활동에서 맡은 역할은?", source=SOURCE_ADDITIONAL, doc_ref="과학 동아리")
+    assert dedupe_questions([first, second]) == [first, second]
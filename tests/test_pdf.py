@@ -0,0 +1,141 @@
+"""PDF 추출 결과/실패 원인 (pypdf로 테스트용 PDF를 직접 만든다)."""
+import io
+import sys
+import threading
+import time
+import types
+
+import pytest
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from core import pdf
+from core.pdf import ENCRYPTED, NO_TEXT, UNREADABLE, extract_pdf, extract_text
+
+
+def _pdf(text: str | None = "Hello NEIS", pages: int = 1, password: str | None = None) -> io.BytesIO:
+    writer = PdfWriter()
+    for _ in range(pages):
+        page = writer.add_blank_page(width=300, height=300)
+        if text is None:
+            continue
+        font = DictionaryObject({
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        })
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): writer._add_object(font)}),
+        })
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 20 200 Td ({text}) Tj ET".encode("latin-1"))
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    if password is not None:
+        writer.encrypt(user_password=password, owner_password="owner")
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_extracts_text_and_page_count():
+    result = extract_pdf(_pdf(pages=2))
+    assert result.error is None
+    assert result.pages == 2
+    assert "Hello NEIS" in result.text
+
+
+def test_blank_password_pdf_is_decrypted():
+    assert "Hello NEIS" in extract_pdf(_pdf(password="")).text
+
+
+def test_failure_reasons():
+    assert extract_pdf(_pdf(password="secret")).error == ENCRYPTED
+    blank = extract_pdf(_pdf(text=None))
+    assert (blank.text, blank.pages, blank.error) == (None, 1, NO_TEXT)
+    assert extract_pdf(io.BytesIO(b"not a pdf")).error == UNREADABLE
+
+
+def test_extract_text_keeps_none_contract():
+    assert extract_text(None) is None
+    assert extract_text(_pdf(text=None)) is None
+    assert "Hello NEIS" in extract_text(_pdf())
+
+
+def test_calibration_picks_fastest_acceptable_backend(monkeypatch):
+    good = _pdf().getvalue()
+    pages = {"pypdf": ["Hello NEIS"], "fast_garbled": [" NEIS"], "fast_ok": ["Hello NEIS "]}
+    timings = {"pypdf": 0.5, "fast_garbled": 0.01, "fast_ok": 0.1}
+    clock = {"now": 0.0}
+
+    def backend(name):
+        def run(data):
+            clock["now"] += timings[name]
+            return pages[name]
+        return run
+
+    monkeypatch.setattr(pdf, "_BACKENDS", {name: backend(name) for name in pages})
+    monkeypatch.setattr(pdf.time, "perf_counter", lambda: clock["now"])
+
+    result = pdf.calibrate([good, good], ["pypdf", "fast_garbled", "fast_ok"])
+    assert result.backend == "fast_ok"
+    assert result.seconds == pytest.approx({"pypdf": 1.0, "fast_ok": 0.2})
+    assert set(result.rejected) == {"fast_garbled"}
+
+
+def test_optional_backend_failure_falls_back_to_pypdf(monkeypatch):
+    def broken(data):
+        raise RuntimeError("backend crashed")
+
+    monkeypatch.setitem(pdf._BACKENDS, "pypdfium2", broken)
+    result = extract_pdf(_pdf().getvalue(), backend="pypdfium2")
+    assert result.backend == "pypdf"
+    assert "Hello NEIS" in result.text
+
+
+def test_pypdfium2_calls_are_serialized(monkeypatch):
+    # PDFium은 스레드 안전하지 않다 — 동시에 추출해도 문서를 여는 순간부터 닫을 때까지 겹치면 안 된다.
+    state = {"open": 0, "overlap": False}
+
+    class FakeTextPage:
+        def get_text_range(self):
+            time.sleep(0.01)
+            return "text"
+
+        def close(self):
+            pass
+
+    class FakePage:
+        def get_textpage(self):
+            return FakeTextPage()
+
+        def close(self):
+            pass
+
+    class FakeDocument:
+        def __init__(self, data, password=None):
+            state["overlap"] |= state["open"] > 0
+            state["open"] += 1
+
+        def __iter__(self):
+            return iter([FakePage(), FakePage()])
+
+        def close(self):
+            state["open"] -= 1
+
+    fake = types.SimpleNamespace(PdfDocument=FakeDocument, PdfiumError=RuntimeError)
+    monkeypatch.setitem(sys.modules, "pypdfium2", fake)
+
+    threads = [threading.Thread(target=pdf._pypdfium2_pages, args=(b"",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert not state["overlap"]
+    assert state["open"] == 0
+
+def test_select_backend_without_samples_uses_installed_preference(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf, "available_backends", lambda: ["pypdf"])
+    assert pdf.select_backend(str(tmp_path)).backend == "pypdf"
+    monkeypatch.setattr(pdf, "available_backends", lambda: ["pypdf", "pypdfium2"])
+    assert pdf.select_backend(str(tmp_path)).backend == "pypdfium2"
@@ -0,0 +1,63 @@
+from core.parsing import SOURCE_ADDITIONAL, Question
+from core.revision import (
+    affected_questions,
+    diff_document,
+    format_diff,
+    report_affected,
+    split_paragraphs,
+)
+
+OLD = (
+    "1. 지원 동기\n\n"
+    "로봇 동아리에서 자율주행 알고리즘을 구현하며 제어 이론에 흥미를 느꼈습니다.\n\n"
+    "2. 학업 경험\n\n"
+    "수학 세특에서 미분방정식으로 감염병 확산 모델을 세웠습니다."
+)
+NEW = OLD.replace(
+    "수학 세특에서 미분방정식으로 감염병 확산 모델을 세웠습니다.",
+    "수학 세특에서 편미분방정식으로 열전도 모델을 세웠습니다.",
+)
+
+
+def test_split_paragraphs_falls_back_to_lines():
+    assert split_paragraphs("a\n\nb") == ["a", "b"]
+    assert split_paragraphs("첫 줄\n둘째 줄") == ["첫 줄", "둘째 줄"]
+
+
+def test_diff_document_reports_changed_paragraph_and_section():
+    diff = diff_document("자기소개서", OLD, NEW)
+    assert diff.removed == ["수학 세특에서 미분방정식으로 감염병 확산 모델을 세웠습니다."]
+    assert diff.added == ["수학 세특에서 편미분방정식으로 열전도 모델을 세웠습니다."]
+    assert diff.inserted == []
+    assert diff.sections == ["2. 학업 경험"]
+    assert "- 수학 세특에서 미분방정식" in format_diff([diff])
+
+
+def test_whitespace_only_changes_are_ignored():
+    assert not diff_document("자기소개서", OLD, OLD.replace("흥미를 느꼈습니다", "흥미를  느꼈습니다")).changed
+
+
+def test_report_affected_by_quote_or_verbatim_overlap():
+    diff = diff_document("자기소개서", OLD, NEW)
+    quoting = "지원자는 '감염병 확산 모델'을 언급했다."
+    verbatim = "서류: 미분방정식으로 감염병 확산 모델을 세웠습니다 — 한계는?"
+    unrelated = "로봇 동아리 활동의 리더십을 평가한다."
+    assert report_affected(quoting, [diff], generates_questions=False)
+    assert report_affected(verbatim, [diff], generates_questions=False)
+    assert not report_affected(unrelated, [diff], generates_questions=True)
+
+
+def test_pure_insertion_affects_only_question_reports():
+    diff = diff_document("자기소개서", OLD, OLD + "\n\n3. 진로 계획\n\n핵융합 연구자가 되고 싶습니다.")
+    assert diff.inserted and not diff.removed
+    assert report_affected("로봇 동아리 질문", [diff], generates_questions=True)
+    assert not report_affected("로봇 동아리 전략", [diff], generates_questions=False)
+
+
+def test_affected_questions_uses_doc_ref():
+    diff = diff_document("자기소개서", OLD, NEW)
+    questions = [
+        Question(id="A1", text="모델의 가정은 무엇인가요?", source=SOURCE_ADDITIONAL, doc_ref="감염병 확산 모델"),
+        Question(id="A2", text="동아리에서 맡은 역할은?", source=SOURCE_ADDITIONAL, doc_ref="로봇 동아리"),
+    ]
+    assert [q.id for q in affected_questions(questions, [diff])] == ["A1"]
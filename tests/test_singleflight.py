@@ -0,0 +1,110 @@
+"""SingleFlight 동시 호출 합치기 (스레드로 동시성 재현)."""
+import threading
+import time
+
+import pytest
+
+from core.singleflight import SingleFlight
+
+
+def _wait_for_waiters(flight, key, count):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        with flight._lock:
+            call = flight._calls.get(key)
+            if call is not None and call.waiters >= count:
+                return
+        time.sleep(0.01)
+    raise AssertionError("waiters did not join in time")
+
+
+def _run_concurrently(flight, key, fn, callers):
+    results = [None] * callers
+
+    def worker(i):
+        try:
+            results[i] = flight.do(key, fn)
+        except BaseException as exc:
+            results[i] = exc
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_identical_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return "보고서"
+
+    threads, results = _run_concurrently(flight, "k", fn, 4)
+    _wait_for_waiters(flight, "k", 3)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["보고서"] * 4
+    assert len(calls) == 1
+    assert flight.stats() == {"issued": 1, "coalesced": 3, "in_flight": 0}
+
+
+def test_leader_error_is_shared_and_cleared():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fn():
+        release.wait(5)
+        raise ValueError("boom")
+
+    threads, results = _run_concurrently(flight, "k", fn, 3)
+    _wait_for_waiters(flight, "k", 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert all(isinstance(r, ValueError) for r in results)
+    # 실패한 호출은 남지 않으므로 다음 호출은 새로 실행된다.
+    assert flight.do("k", lambda: "retry") == "retry"
+    assert flight.stats()["issued"] == 2
+
+
+def test_abandoned_leader_hands_over_to_waiter():
+    class _SessionGone(BaseException):
+        pass
+
+    flight = SingleFlight()
+    release = threading.Event()
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        if len(attempts) == 1:
+            release.wait(5)
+            raise _SessionGone()
+        return "ok"
+
+    leader = threading.Thread(target=lambda: pytest.raises(_SessionGone, flight.do, "k", fn))
+    leader.start()
+    threads, results = _run_concurrently(flight, "k", fn, 1)
+    _wait_for_waiters(flight, "k", 1)
+    release.set()
+    leader.join(5)
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["ok"]
+    assert len(attempts) == 2
+    assert flight.stats() == {"issued": 2, "coalesced": 0, "in_flight": 0}
+
+
+def test_different_keys_do_not_coalesce():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.stats()["issued"] == 2
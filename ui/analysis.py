@@ -2,11 +2,23 @@
 import streamlit as st
 
 from core.config import MAX_DOC_CHARS, Settings
-from core.gemini import create_interview_chat, generate_report, get_client
-from core.parsing import parse_questions_from_report
-from core.pdf import extract_text
+from core.gemini import generate_report, get_client, open_interview
+from core.jobs import DONE, PRIORITY_CHAT, PRIORITY_INITIAL, PRIORITY_REPORT, Job, get_extraction_runner
+from core.parsing import collect_questions, format_question_list, format_questions_context, question_section, split_report
+from core.pdf import DEFAULT_BACKEND, ENCRYPTED, NO_TEXT, UNREADABLE, extract_pdf, select_backend
+from core.revision import affected_questions, diff_document, format_diff, report_affected
 from core.state import reset_analysis_state
-from ui.common import download_report_button, error_box, render_header
+from ui.common import (
+    JOB_POLL_SECONDS,
+    download_report_button,
+    drop_job,
+    error_box,
+    job_pending,
+    render_header,
+    render_job_status,
+    submit_job,
+    take_finished_job,
+)
 
 # PROMPT_SECRET에 정의된 명령어 체계 — 프롬프트와의 호환을 위해 원문 유지
 CMD_INITIAL = "이제 초기 분석을 시작하고 [초기 분석 보고서 및 대표 질문 5개]를 생성해주세요."
@@ -16,6 +28,12 @@ CMD_MODEL_ANSWERS = (
     "On command: '모범답안생성'\n"
     "이제 위 질문 전체에 대한 [전략적 모범 답안 패키지]를 생성해주세요."
 )
+CMD_REVISE = (
+    "On command: '수정본반영'\n"
+    "지원자가 서류 수정본을 제출했습니다. 위 [서류 변경 사항]의 영향을 받는 질문과 섹션만 "
+    "수정본 기준으로 다시 작성하고, 나머지는 [이전 보고서]의 내용과 형식을 그대로 유지한 "
+    "전체 보고서를 출력해주세요."
+)
 
 CONSENT_TEXT = (
     "업로드한 생활기록부·자기소개서는 면접 예상 질문 생성을 위해 Google Gemini API로 "
@@ -24,14 +42,60 @@ CONSENT_TEXT = (
 )
 
 
+# 백그라운드 작업으로 생성되어 같은 이름의 state 키에 저장되는 보고서
+REPORT_KEYS = ("initial_result", "additional_questions", "premium_report", "model_answers")
+# 질문을 만들어내는 보고서 — 서류에 문단이 새로 추가되면 수정본 반영 대상이 된다
+QUESTION_REPORT_KEYS = ("initial_result", "additional_questions")
+REPORT_TITLES = {
+    "initial_result": "초기 분석 보고서",
+    "additional_questions": "심층 해부 질문",
+    "premium_report": "종합 전략 보고서",
+    "model_answers": "전략적 모범 답안",
+}
+# 수정본 반영 갱신 작업의 키 접두어 — 결과는 모두 모인 뒤 REPORT_KEYS에 한꺼번에 반영한다
+REVISION_JOB_PREFIX = "revise:"
+# 분석 화면이 _collect_finished_jobs로 결과를 가져가는 작업 키
+ANALYSIS_JOB_KEYS = (*REPORT_KEYS, *(REVISION_JOB_PREFIX + key for key in REPORT_KEYS), "simulation_start")
+
+
 def render_analysis(settings: Settings) -> None:
     render_header(settings.target_exam)
+    _collect_finished_jobs(settings)
     if not st.session_state.analysis_complete:
         _render_upload(settings)
     else:
         _render_workspace(settings)
 
 
+def _collect_finished_jobs(settings: Settings) -> None:
+    """이전 rerun에서 제출한 작업 중 끝난 것의 결과를 state에 반영한다."""
+    _collect_revision_jobs(get_client(settings.api_key), settings)
+    for key in REPORT_KEYS:
+        job = take_finished_job(key)
+        if job is None:
+            continue
+        if job.error is not None:
+            error_box("AI 분석 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.", job.error)
+            continue
+        st.session_state[key] = job.result
+        if key == "initial_result":
+            st.session_state.analysis_complete = True
+
+    job = take_finished_job("simulation_start")
+    if job is None:
+        return
+    if job.error is not None:
+        error_box("시뮬레이션 준비 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.", job.error)
+        return
+    chat, first_question = job.result
+    st.session_state.chat = chat
+    st.session_state.sim_start_prompt = job.meta["start_prompt"]
+    st.session_state.sim_context = job.meta["sim_context"]
+    st.session_state.messages = [{"role": "assistant", "content": first_question}]
+    st.session_state.simulation_mode = True
+    st.rerun()
+
+
 # --- 1단계: 업로드 & 초기 분석 ---
 
 def _render_upload(settings: Settings) -> None:
@@ -41,14 +105,23 @@ def _render_upload(settings: Settings) -> None:
         unsafe_allow_html=True,
     )
     st.divider()
+    if job_pending("initial_result"):
+        render_job_status(["initial_result"])
+        return
+
     st.subheader("1. 분석 자료 업로드")
     st.write("생기부와 자소서 PDF 파일을 각각 업로드해주세요.")
 
     col1, col2 = st.columns(2)
     with col1:
-        life_record_file = st.file_uploader("📄 생활기록부 PDF 업로드", type=["pdf"])
+        life_record_file = st.file_uploader("📄 생활기록부 PDF 업로드", type=["pdf"], key="upload_life_record")
+        life_record_job = _start_extraction("upload_life_record", life_record_file)
+        _render_extraction_status("upload_life_record", life_record_job)
     with col2:
-        cover_letter_file = st.file_uploader("✍️ 자기소개서 PDF 업로드", type=["pdf"])
+        cover_letter_file = st.file_uploader("✍️ 자기소개서 PDF 업로드", type=["pdf"], key="upload_cover_letter")
+        cover_letter_job = _start_extraction("upload_cover_letter", cover_letter_file)
+        _render_extraction_status("upload_cover_letter", cover_letter_job)
+    _await_extractions([life_record_job, cover_letter_job])
 
     st.info(CONSENT_TEXT, icon="🔒")
     consent = st.checkbox("위 내용을 확인했으며 개인정보 제공에 동의합니다.")
@@ -64,59 +137,172 @@ def _render_upload(settings: Settings) -> None:
     if not start:
         return
 
-    if not (life_record_file and cover_letter_file):
+    if not (life_record_job and cover_letter_job):
         st.warning("두 개의 PDF 파일을 모두 업로드해주세요.")
         return
 
-    with st.spinner("PDF에서 텍스트를 추출하는 중..."):
-        life_record_text = extract_text(life_record_file)
-        cover_letter_text = extract_text(cover_letter_file)
+    texts = _extracted_texts({"생활기록부": life_record_job, "자기소개서": cover_letter_job})
+    if error := _validation_error(texts):
+        st.error(error)
+        return
+    life_record_text, cover_letter_text = texts["생활기록부"], texts["자기소개서"]
 
-    failed = []
-    if not life_record_text:
-        failed.append("생활기록부")
-    if not cover_letter_text:
-        failed.append("자기소개서")
+    client = get_client(settings.api_key)
+    submit_job(
+        "initial_result", PRIORITY_INITIAL,
+        lambda job: generate_report(
+            client=client,
+            model=settings.pro_model,
+            system_prompt=settings.system_prompt,
+            life_record=life_record_text,
+            cover_letter=cover_letter_text,
+            command=CMD_INITIAL,
+        ),
+        label="AI가 서류를 분석하고 있습니다... (1~2분 정도 걸릴 수 있어요)",
+    )
+    st.session_state.life_record = life_record_text
+    st.session_state.cover_letter = cover_letter_text
+    _release_extractions("upload_life_record", "upload_cover_letter")
+    st.rerun()
+
+
+# --- 업로드 즉시 추출/검증 ---
+# 파일이 올라오는 순간 별도 워커에서 추출을 시작해, 동의 체크 후 버튼을 누를 때쯤엔
+# 텍스트가 준비되어 바로 분석을 시작할 수 있게 한다.
+
+_EXTRACTION_PROBLEMS = {
+    ENCRYPTED: "암호화된 PDF입니다",
+    NO_TEXT: "텍스트가 없습니다 (스캔/이미지형 PDF?)",
+    UNREADABLE: "PDF를 읽을 수 없습니다",
+}
+
+
+_SLOT_DOCUMENTS = {
+    "upload_life_record": "생활기록부",
+    "upload_cover_letter": "자기소개서",
+    "revise_life_record": "생활기록부",
+    "revise_cover_letter": "자기소개서",
+}
+
+
+@st.cache_resource
+def _backend_selection() -> Job:
+    """추출 백엔드 선택(샘플이 있으면 보정 벤치마크)은 서버당 한 번, 추출 워커에서 한다."""
+    return get_extraction_runner().submit("pdf-calibration", PRIORITY_REPORT, lambda job: select_backend())
+
+
+def _pdf_backend() -> str:
+    """선택된 추출 백엔드. 보정이 끝나기 전(또는 실패하면)에는 기본 백엔드로 추출한다."""
+    job = _backend_selection()
+    return job.result.backend if job.status == DONE else DEFAULT_BACKEND
+
+
+def _start_extraction(slot: str, uploaded_file) -> Job | None:
+    """업로더(slot)에 올라온 파일의 추출 작업. 같은 파일이면 이미 시작한 작업을 재사용한다."""
+    extractions = st.session_state.extractions
+    runner = get_extraction_runner()
+    entry = extractions.get(slot)
+    if entry and uploaded_file is not None and entry["file_id"] == uploaded_file.file_id:
+        if job := runner.get(entry["job_id"]):
+            return job
+    if entry:
+        # 파일을 지웠거나 바꿨으면 이전 추출 결과(서류 원문)를 실행기에서 지운다.
+        _log_extraction(slot)
+        runner.discard(entry["job_id"])
+        del extractions[slot]
+    if uploaded_file is None:
+        return None
+    data = uploaded_file.getvalue()
+    backend = _pdf_backend()
+    job = runner.submit(st.session_state.session_id, PRIORITY_INITIAL, lambda job: extract_pdf(data, backend))
+    extractions[slot] = {"file_id": uploaded_file.file_id, "job_id": job.id}
+    return job
+
+
+def _release_extractions(*slots: str) -> None:
+    """텍스트를 state로 옮긴 뒤 추출 작업(결과에 서류 원문)을 실행기에서 지운다."""
+    runner = get_extraction_runner()
+    for slot in slots:
+        _log_extraction(slot)
+        if entry := st.session_state.extractions.pop(slot, None):
+            runner.discard(entry["job_id"])
+
+
+def _log_extraction(slot: str) -> None:
+    """업로드(file_id)마다 한 번, 추출이 끝나면 어떤 백엔드로 몇 초 걸렸는지 extraction_log에 남긴다."""
+    entry = st.session_state.extractions.get(slot)
+    if entry is None or entry.get("logged"):
+        return
+    job = get_extraction_runner().get(entry["job_id"])
+    if job is None or not job.finished:
+        return
+    entry["logged"] = True
+    if job.result is not None:
+        st.session_state.extraction_log.append({
+            "document": _SLOT_DOCUMENTS.get(slot, slot),
+            "backend": job.result.backend,
+            "seconds": round(job.result.seconds, 3),
+            "pages": job.result.pages,
+            "chars": len(job.result.text or ""),
+            "error": job.result.error,
+        })
+
+
+def _render_extraction_status(slot: str, job: Job | None) -> None:
+    if job is None:
+        return
+    if not job.finished:
+        st.caption("⏳ 텍스트 추출 중...")
+        return
+    _log_extraction(slot)
+    result = job.result
+    if result is None or result.error:
+        problem = _EXTRACTION_PROBLEMS.get(result.error) if result else None
+        st.caption(f"❌ {problem or '텍스트 추출에 실패했습니다'}")
+    elif len(result.text) > MAX_DOC_CHARS:
+        st.caption(f"⚠️ {result.pages}쪽 · {len(result.text):,}자 — 허용 한도({MAX_DOC_CHARS:,}자) 초과")
+    else:
+        st.caption(f"✅ {result.pages}쪽 · {len(result.text):,}자 · {result.backend} {result.seconds:.2f}초")
+
+
+def _await_extractions(jobs: list[Job | None]) -> None:
+    """추출이 진행 중이면 끝나는 대로 화면을 다시 그려 상태를 갱신한다."""
+    pending = [job for job in jobs if job is not None and not job.finished]
+    if pending:
+        _extraction_poller(pending)
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def _extraction_poller(jobs: list[Job]) -> None:
+    if all(job.finished for job in jobs):
+        st.rerun()
+
+
+def _extracted_texts(jobs: dict[str, Job]) -> dict[str, str | None]:
+    """{서류명: 추출 작업} → {서류명: 텍스트}. 아직 끝나지 않은 작업은 기다린다 (대개 이미 끝나 있다)."""
+    if not all(job.finished for job in jobs.values()):
+        with st.spinner("PDF에서 텍스트를 추출하는 중..."):
+            for job in jobs.values():
+                job.wait()
+    return {label: job.result.text if job.result else None for label, job in jobs.items()}
+
+
+def _validation_error(texts: dict[str, str | None]) -> str | None:
+    """추출 결과({서류명: 텍스트}) 검증. 문제가 있으면 사용자에게 보여줄 메시지를 반환한다."""
+    failed = [label for label, text in texts.items() if not text]
     if failed:
-        st.error(
+        return (
             f"{' / '.join(failed)} PDF에서 텍스트를 추출하지 못했습니다. "
             "스캔(이미지)형이거나 암호화된 PDF는 지원되지 않습니다 — "
             "나이스(NEIS) 등에서 텍스트형 PDF로 다시 발급해 업로드해주세요."
         )
-        return
-
-    too_long = []
-    if len(life_record_text) > MAX_DOC_CHARS:
-        too_long.append(f"생활기록부({len(life_record_text):,}자)")
-    if len(cover_letter_text) > MAX_DOC_CHARS:
-        too_long.append(f"자기소개서({len(cover_letter_text):,}자)")
+    too_long = [f"{label}({len(text):,}자)" for label, text in texts.items() if len(text) > MAX_DOC_CHARS]
     if too_long:
-        st.error(
+        return (
             f"{' / '.join(too_long)}이(가) 허용 한도({MAX_DOC_CHARS:,}자)를 초과했습니다. "
             "올바른 서류 PDF인지 확인해주세요. 일반적인 생기부/자소서는 이 한도를 넘지 않습니다."
         )
-        return
-
-    try:
-        with st.spinner("AI가 서류를 분석하고 있습니다... (1~2분 정도 걸릴 수 있어요)"):
-            client = get_client(settings.api_key)
-            initial_result = generate_report(
-                client=client,
-                model=settings.pro_model,
-                system_prompt=settings.system_prompt,
-                life_record=life_record_text,
-                cover_letter=cover_letter_text,
-                command=CMD_INITIAL,
-            )
-    except Exception as exc:
-        error_box("AI 분석 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.", exc)
-        return
-
-    st.session_state.life_record = life_record_text
-    st.session_state.cover_letter = cover_letter_text
-    st.session_state.initial_result = initial_result
-    st.session_state.analysis_complete = True
-    st.rerun()
+    return None
 
 
 # --- 2단계: 분석 완료 후 워크스페이스 ---
@@ -132,40 +318,247 @@ def _render_workspace(settings: Settings) -> None:
         reset_analysis_state()
         st.rerun()
 
+    _render_revision(client, settings)
+
     st.divider()
     _render_deep_features(client, settings)
+    render_job_status(ANALYSIS_JOB_KEYS)
     st.divider()
     _render_simulation_launcher(client, settings)
     _render_results_archive()
 
 
 def _run_report(client, settings: Settings, state_key: str, command: str, spinner: str, extra_context: str | None = None) -> None:
-    try:
-        with st.spinner(spinner):
-            st.session_state[state_key] = generate_report(
-                client=client,
-                model=settings.pro_model,
-                system_prompt=settings.system_prompt,
-                life_record=st.session_state.life_record,
-                cover_letter=st.session_state.cover_letter,
-                command=command,
-                extra_context=extra_context,
+    _submit_report(client, settings, state_key, command, spinner, extra_context)
+    st.rerun()
+
+
+def _submit_report(client, settings: Settings, state_key: str, command: str, spinner: str, extra_context: str | None = None) -> None:
+    """보고서 생성을 백그라운드 작업으로 제출한다. 결과는 이후 rerun에서 state_key에 저장된다."""
+    life_record = st.session_state.life_record
+    cover_letter = st.session_state.cover_letter
+    submit_job(
+        state_key, PRIORITY_REPORT,
+        lambda job: generate_report(
+            client=client,
+            model=settings.pro_model,
+            system_prompt=settings.system_prompt,
+            life_record=life_record,
+            cover_letter=cover_letter,
+            command=command,
+            extra_context=extra_context,
+        ),
+        label=spinner,
+    )
+
+
+def _render_revision(client, settings: Settings) -> None:
+    """서류 수정본을 받아 바뀐 문단과 관련된 보고서·질문만 다시 생성한다."""
+    pending = st.session_state.revision_pending
+    with st.expander("✏️ 서류 수정본 반영하기 (바뀐 부분만 다시 분석)", expanded=bool(pending and pending["failed"])):
+        st.write(
+            "서류를 고친 뒤 수정한 PDF만 올리면, 바뀐 문단과 관련된 보고서와 질문만 새로 "
+            "생성합니다. 이전 버전은 아래 '이전 버전과 비교'에서 확인할 수 있습니다."
+        )
+        if pending is not None:
+            _render_revision_progress(client, settings)
+            return
+        col1, col2 = st.columns(2)
+        with col1:
+            life_record_file = st.file_uploader("📄 생활기록부 수정본", type=["pdf"], key="revise_life_record")
+            life_record_job = _start_extraction("revise_life_record", life_record_file)
+            _render_extraction_status("revise_life_record", life_record_job)
+        with col2:
+            cover_letter_file = st.file_uploader("✍️ 자기소개서 수정본", type=["pdf"], key="revise_cover_letter")
+            cover_letter_job = _start_extraction("revise_cover_letter", cover_letter_file)
+            _render_extraction_status("revise_cover_letter", cover_letter_job)
+        _await_extractions([life_record_job, cover_letter_job])
+        busy = any(job_pending(key) for key in REPORT_KEYS)
+        if not st.button("수정본 반영", use_container_width=True, disabled=busy):
+            return
+        if not (life_record_job or cover_letter_job):
+            st.warning("수정한 PDF를 하나 이상 업로드해주세요.")
+            return
+
+        revised = _extracted_texts({
+            label: job for label, job in (("생활기록부", life_record_job), ("자기소개서", cover_letter_job)) if job
+        })
+        texts = {
+            "생활기록부": st.session_state.life_record,
+            "자기소개서": st.session_state.cover_letter,
+            **revised,
+        }
+        if error := _validation_error(texts):
+            st.error(error)
+            return
+
+        diffs = [
+            diff_document("생활기록부", st.session_state.life_record, texts["생활기록부"]),
+            diff_document("자기소개서", st.session_state.cover_letter, texts["자기소개서"]),
+        ]
+        if not any(diff.changed for diff in diffs):
+            st.info("이전 버전과 달라진 내용이 없습니다.")
+            return
+
+    questions = collect_questions(st.session_state.initial_result, st.session_state.additional_questions)
+    stale_questions = affected_questions(questions, diffs)
+    stale = [
+        key for key in QUESTION_REPORT_KEYS + ("premium_report",)
+        if report_affected(st.session_state[key], diffs, generates_questions=key in QUESTION_REPORT_KEYS)
+    ]
+    # 모범 답안은 직접 영향을 받았거나, 답해야 할 질문(보고서)이 바뀌면 갱신한다.
+    if st.session_state.model_answers and (
+        report_affected(st.session_state.model_answers, diffs, generates_questions=False)
+        or stale_questions
+        or any(key in stale for key in QUESTION_REPORT_KEYS)
+    ):
+        stale.append("model_answers")
+
+    # 서류와 보고서는 모든 갱신 작업이 성공한 뒤에 한꺼번에 교체한다 (_commit_revision).
+    st.session_state.revision_pending = {
+        "life_record": texts["생활기록부"],
+        "cover_letter": texts["자기소개서"],
+        "diff": format_diff(diffs),
+        "stale_questions": format_question_list(stale_questions) or "(없음 — 추가된 내용에 대한 질문만 보완)",
+        "keys": stale,
+        "results": {},
+        "failed": [],
+    }
+    if not stale:
+        _commit_revision()
+        st.toast("바뀐 내용이 기존 보고서에 영향을 주지 않아 서류만 교체했습니다.")
+    else:
+        _submit_revisions(client, settings)
+    st.rerun()
+
+
+def _render_revision_progress(client, settings: Settings) -> None:
+    """수정본 반영이 진행 중일 때 — 남은 보고서와 실패한 보고서(재시도/취소)를 보여준다."""
+    pending = st.session_state.revision_pending
+    waiting = [REPORT_TITLES[key] for key in pending["keys"] if key not in pending["results"]]
+    st.info(
+        f"수정본을 반영하는 중입니다 — 남은 보고서: {', '.join(waiting)}. "
+        "모든 보고서가 갱신되면 서류와 보고서가 함께 수정본으로 교체됩니다."
+    )
+    if not pending["failed"] or any(job_pending(REVISION_JOB_PREFIX + key) for key in pending["keys"]):
+        return
+    failed = ", ".join(REPORT_TITLES[key] for key in pending["failed"])
+    st.warning(f"갱신에 실패한 보고서: {failed}")
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("실패한 보고서 다시 생성", use_container_width=True, type="primary"):
+            pending["failed"] = []
+            _submit_revisions(client, settings)
+            st.rerun()
+    with col2:
+        if st.button("수정본 반영 취소", use_container_width=True):
+            for key in pending["keys"]:
+                drop_job(REVISION_JOB_PREFIX + key)
+            st.session_state.revision_pending = None
+            st.rerun()
+
+
+def _submit_revisions(client, settings: Settings) -> None:
+    """아직 결과가 없는 갱신 대상 보고서를 제출한다.
+
+    모범 답안은 질문 보고서의 갱신이 모두 끝난 뒤에 새 질문 목록으로 제출한다
+    (_collect_revision_jobs가 질문 보고서를 가져갈 때마다 다시 부른다).
+    """
+    pending = st.session_state.revision_pending
+    results = pending["results"]
+    questions_ready = all(key in results for key in pending["keys"] if key in QUESTION_REPORT_KEYS)
+    for key in pending["keys"]:
+        if key in results or key in pending["failed"] or job_pending(REVISION_JOB_PREFIX + key):
+            continue
+        extra_context = (
+            f"[서류 변경 사항]\n{pending['diff']}\n\n"
+            f"[영향받는 질문]\n{pending['stale_questions']}\n\n"
+            f"[이전 보고서]\n{st.session_state[key]}"
+        )
+        if key == "model_answers":
+            if not questions_ready:
+                continue
+            questions = _questions_context(
+                results.get("initial_result", st.session_state.initial_result),
+                results.get("additional_questions", st.session_state.additional_questions),
             )
-    except Exception as exc:
-        error_box("보고서 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.", exc)
+            extra_context += f"\n\n[답변해야 할 질문 목록]\n{questions}"
+        _submit_revision_job(client, settings, key, pending["life_record"], pending["cover_letter"], extra_context)
+
+
+def _submit_revision_job(
+    client, settings: Settings, key: str, life_record: str, cover_letter: str, extra_context: str,
+) -> None:
+    submit_job(
+        REVISION_JOB_PREFIX + key, PRIORITY_REPORT,
+        lambda job: generate_report(
+            client=client,
+            model=settings.pro_model,
+            system_prompt=settings.system_prompt,
+            life_record=life_record,
+            cover_letter=cover_letter,
+            command=CMD_REVISE,
+            extra_context=extra_context,
+        ),
+        label=f"수정본을 반영해 {REPORT_TITLES[key]}을(를) 갱신하고 있습니다...",
+    )
+
+
+def _collect_revision_jobs(client, settings: Settings) -> None:
+    """끝난 갱신 작업의 결과를 모으고, 다 모이면 수정본을 반영한다. 실패한 보고서는 재시도 대상으로 남긴다."""
+    pending = st.session_state.revision_pending
+    if pending is None:
         return
-    st.rerun()
+    for key in pending["keys"]:
+        job = take_finished_job(REVISION_JOB_PREFIX + key)
+        if job is None:
+            continue
+        if job.error is not None:
+            pending["failed"].append(key)
+            error_box(
+                f"{REPORT_TITLES[key]} 갱신 중 오류가 발생했습니다. '서류 수정본 반영하기'에서 다시 시도할 수 있습니다.",
+                job.error,
+            )
+        else:
+            pending["results"][key] = job.result
+    if all(key in pending["results"] for key in pending["keys"]):
+        _commit_revision()
+        st.toast("수정본 반영이 끝났습니다.")
+    else:
+        _submit_revisions(client, settings)
+
+
+def _commit_revision() -> None:
+    """반영 전 상태를 revisions에 남기고, 서류와 갱신된 보고서를 한꺼번에 수정본으로 교체한다."""
+    pending = st.session_state.revision_pending
+    st.session_state.revisions.append({
+        "life_record": st.session_state.life_record,
+        "cover_letter": st.session_state.cover_letter,
+        **{key: st.session_state[key] for key in REPORT_KEYS},
+        "diff": pending["diff"],
+    })
+    st.session_state.life_record = pending["life_record"]
+    st.session_state.cover_letter = pending["cover_letter"]
+    for key, result in pending["results"].items():
+        st.session_state[key] = result
+    st.session_state.revision_pending = None
 
 
 def _render_deep_features(client, settings: Settings) -> None:
     st.subheader("⚙️ 심층 분석 기능")
     st.write("서류의 모든 잠재적 약점을 파고드는 심층 분석으로 면접을 완벽하게 대비하세요.")
 
+    # 수정본 반영 중에는 곧 교체될 옛 서류로 새 작업을 시작하지 않는다.
+    revising = st.session_state.revision_pending is not None
+    if revising:
+        st.caption("ℹ️ 수정본 반영이 끝나면 다시 사용할 수 있습니다.")
+
     col1, col2, col3 = st.columns(3)
 
     with col1:
         questions_done = bool(st.session_state.additional_questions)
-        if st.button("추가 질문 추출 (20개)", use_container_width=True, disabled=questions_done):
+        questions_busy = job_pending("additional_questions")
+        if st.button("추가 질문 추출 (20개)", use_container_width=True, disabled=questions_done or questions_busy or revising):
             _run_report(
                 client, settings, "additional_questions", CMD_ADDITIONAL,
                 "서류의 특정 문장과 단어까지 파고드는 20개의 정밀 타격 질문을 생성 중입니다...",
@@ -175,7 +568,8 @@ def _render_deep_features(client, settings: Settings) -> None:
 
     with col2:
         report_done = bool(st.session_state.premium_report)
-        if st.button("종합 전략 보고서", use_container_width=True, disabled=report_done):
+        report_busy = job_pending("premium_report")
+        if st.button("종합 전략 보고서", use_container_width=True, disabled=report_done or report_busy or revising):
             _run_report(
                 client, settings, "premium_report", CMD_STRATEGY,
                 "합격 시나리오와 4D 전략 분석을 포함한 최종 보고서를 생성 중입니다...",
@@ -185,15 +579,15 @@ def _render_deep_features(client, settings: Settings) -> None:
 
     with col3:
         questions_ready = bool(st.session_state.additional_questions)
-        if st.button("전략적 모범 답안 생성", use_container_width=True, disabled=not questions_ready):
-            initial_questions = parse_questions_from_report(st.session_state.initial_result)
-            questions_context = "\n\n---\n\n".join(
-                [initial_questions, st.session_state.additional_questions]
-            )
+        answers_busy = job_pending("model_answers")
+        if st.button("전략적 모범 답안 생성", use_container_width=True, disabled=not questions_ready or answers_busy or revising):
             _run_report(
                 client, settings, "model_answers", CMD_MODEL_ANSWERS,
                 "모든 질문에 대한 모범 답안을 생성 중입니다...",
-                extra_context=f"[답변해야 할 질문 목록]\n{questions_context}",
+                extra_context=(
+                    "[답변해야 할 질문 목록]\n"
+                    f"{_questions_context(st.session_state.initial_result, st.session_state.additional_questions)}"
+                ),
             )
         if not questions_ready:
             st.caption("ℹ️ '추가 질문 추출'을 먼저 실행해야 모범 답안을 생성할 수 있습니다.")
@@ -206,7 +600,11 @@ def _render_simulation_launcher(client, settings: Settings) -> None:
     difficulty = st.slider("면접 난이도 설정 (1~10)", 1, 10, 5)
     feedback_mode = st.toggle("답변 후 실시간 피드백 ON/OFF", value=True)
 
-    if not st.button("면접 시뮬레이션 시작하기", use_container_width=True, type="primary"):
+    starting = job_pending("simulation_start")
+    revising = st.session_state.revision_pending is not None
+    if not st.button(
+        "면접 시뮬레이션 시작하기", use_container_width=True, type="primary", disabled=starting or revising,
+    ):
         return
 
     feedback_status = "ON" if feedback_mode else "OFF"
@@ -218,36 +616,53 @@ def _render_simulation_launcher(client, settings: Settings) -> None:
     )
 
     sim_context = _simulation_context()
-    try:
-        with st.spinner("AI 면접관을 준비 중입니다..."):
-            chat = create_interview_chat(
-                client=client,
-                model=settings.flash_model,
-                system_prompt=settings.system_prompt,
-                life_record=st.session_state.life_record,
-                cover_letter=st.session_state.cover_letter,
-                context_reports=sim_context,
-            )
-            first_question = (chat.send_message(start_prompt).text or "").strip()
-    except Exception as exc:
-        error_box("시뮬레이션 준비 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.", exc)
-        return
-
-    st.session_state.chat = chat
-    st.session_state.sim_start_prompt = start_prompt
-    st.session_state.sim_context = sim_context or ""
-    st.session_state.messages = [{"role": "assistant", "content": first_question}]
-    st.session_state.simulation_mode = True
+    life_record = st.session_state.life_record
+    cover_letter = st.session_state.cover_letter
+
+    submit_job(
+        "simulation_start", PRIORITY_CHAT,
+        lambda job: open_interview(
+            client=client,
+            model=settings.flash_model,
+            system_prompt=settings.system_prompt,
+            life_record=life_record,
+            cover_letter=cover_letter,
+            context_reports=sim_context,
+            start_prompt=start_prompt,
+        ),
+        label="AI 면접관을 준비 중입니다...",
+        start_prompt=start_prompt,
+        sim_context=sim_context or "",
+    )
     st.rerun()
 
 
+def _questions_context(initial: str, additional: str) -> str:
+    """모범 답안용 질문 목록: 초기 보고서의 대표 질문 + 추가 질문 (보고서별 원문 대체는 format_questions_context).
+
+    초기 보고서에 질문 섹션 마커가 없으면 질문만 떼어낼 수 없으므로 보고서 전체를 함께 넣는다.
+    """
+    context = format_questions_context(initial, additional)
+    if initial and not question_section(initial):
+        return "\n\n---\n\n".join(filter(None, [initial, context]))
+    return context
+
+
 def _simulation_context() -> str | None:
-    """면접관이 참고할 사전 분석 자료 (있는 것만)."""
+    """면접관이 참고할 사전 분석 자료 (있는 것만) — 분석 본문 + 중복 제거된 질문 목록."""
     sections = []
-    if st.session_state.initial_result:
-        sections.append(f"[초기 분석 보고서 및 대표 질문]:\n{st.session_state.initial_result}")
-    if st.session_state.additional_questions:
-        sections.append(f"[심층 해부 질문 (20개)]:\n{st.session_state.additional_questions}")
+    initial = st.session_state.initial_result
+    if question_section(initial):
+        analysis, _ = split_report(initial)
+        if analysis:
+            sections.append(f"[초기 분석 보고서]:\n{analysis}")
+    elif initial:
+        # 질문 섹션 마커가 없으면 분석 본문만 떼어낼 수 없으므로 원문 전체를 넣고,
+        # 질문 목록에는 추가 질문만 넣는다 (같은 보고서를 두 번 넣지 않도록).
+        sections.append(f"[초기 분석 보고서 및 대표 질문]:\n{initial}")
+    questions = format_questions_context(initial, st.session_state.additional_questions)
+    if questions:
+        sections.append(f"[예상 질문 목록]:\n{questions}")
     return "\n\n".join(sections) or None
 
 
@@ -259,6 +674,7 @@ def _render_results_archive() -> None:
         or st.session_state.additional_questions
         or st.session_state.model_answers
         or st.session_state.simulation_history
+        or st.session_state.revisions
     )
     if not has_results:
         return
@@ -282,6 +698,9 @@ def _render_results_archive() -> None:
             st.markdown(st.session_state.model_answers)
             download_report_button("모범 답안 패키지", st.session_state.model_answers, "모범답안패키지.md", "dl_answers")
 
+    if st.session_state.revisions:
+        _render_revision_compare()
+
     for i, sim in enumerate(reversed(st.session_state.simulation_history)):
         entry_number = len(st.session_state.simulation_history) - i
         if sim["report"]:
@@ -295,3 +714,35 @@ def _render_results_archive() -> None:
             for message in sim["transcript"]:
                 with st.chat_message(message["role"]):
                     st.markdown(message["content"])
+
+
+def _render_revision_compare() -> None:
+    """수정본 반영 전후 비교 — 서류 변경 사항과 바뀐 보고서를 나란히 보여준다."""
+    revisions = st.session_state.revisions
+    with st.expander(f"🕘 이전 버전과 비교 ({len(revisions)}회 수정)"):
+        index = st.selectbox(
+            "비교할 이전 버전",
+            range(len(revisions) - 1, -1, -1),
+            format_func=lambda i: f"버전 {i + 1} (수정 {i + 1}회차 반영 전)",
+        )
+        revision = revisions[index]
+        st.markdown("**서류 변경 사항** (`-` 이전 / `+` 수정본)")
+        st.code(revision["diff"], language="diff")
+
+        unchanged = []
+        for key in REPORT_KEYS:
+            previous, current = revision[key], st.session_state[key]
+            if previous == current:
+                if previous:
+                    unchanged.append(REPORT_TITLES[key])
+                continue
+            st.markdown(f"**{REPORT_TITLES[key]}**")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.caption("이전 버전")
+                st.markdown(previous or "(없음)")
+            with col2:
+                st.caption("현재 버전")
+                st.markdown(current or "(없음)")
+        if unchanged:
+            st.caption(f"변경 없이 유지된 보고서: {', '.join(unchanged)}")
@@ -1,10 +1,17 @@
-"""공통 UI 요소: 헤더, 에러 표시, 다운로드 버튼."""
+"""공통 UI 요소: 헤더, 에러 표시, 다운로드 버튼, 백그라운드 작업 상태."""
 import base64
+import time
 from pathlib import Path
+from typing import Any, Callable, Iterable
 
 import streamlit as st
 
 from core.config import APP_TITLE, LOGO_PATH
+from core.gemini import cache_usage_stats, report_flight_stats
+from core.jobs import QUEUED, Job, get_extraction_runner, get_job_runner
+
+# 작업 진행 상황을 다시 확인하는 주기 (초)
+JOB_POLL_SECONDS = 2
 
 
 def _image_base64(path: str) -> str | None:
@@ -48,3 +55,90 @@ def download_report_button(label: str, text: str, file_name: str, key: str) -> N
         mime="text/markdown",
         key=key,
     )
+
+
+def render_diagnostics() -> None:
+    """운영자용 진단 패널 (secrets의 SHOW_DIAGNOSTICS = true일 때만) — 서버 전역 통계."""
+    with st.sidebar.expander("🛠️ 진단 정보"):
+        st.caption("보고서 호출 — issued: 실제 발행, coalesced: 진행 중인 같은 요청에 합류")
+        st.json(report_flight_stats())
+        st.caption("작업 실행기 (LLM / PDF 추출)")
+        st.json({"llm": get_job_runner().stats(), "extraction": get_extraction_runner().stats()})
+        st.caption("모델별 입력 토큰 중 캐시 적중 비율 (응답 usage_metadata 기준)")
+        st.json(cache_usage_stats())
+
+
+# --- 백그라운드 작업 (core/jobs.py) ---
+# st.session_state.jobs = {결과를 넣을 state 키: job id}. 결과는 이후 rerun에서
+# take_finished_job으로 가져가 같은 state 키에 저장한다.
+
+def submit_job(key: str, priority: int, fn: Callable[[Job], Any], label: str, **meta) -> Job:
+    """작업을 제출하고 state 키에 연결한다. fn 안에서는 st.session_state를 쓰지 말 것."""
+    job = get_job_runner().submit(st.session_state.session_id, priority, fn, label=label, **meta)
+    st.session_state.jobs[key] = job.id
+    return job
+
+
+def get_job(key: str) -> Job | None:
+    """state 키에 연결된 작업. 서버 재시작/보존 기간 만료로 사라졌으면 연결을 끊고 None."""
+    job_id = st.session_state.jobs.get(key)
+    if job_id is None:
+        return None
+    job = get_job_runner().get(job_id)
+    if job is None:
+        st.session_state.jobs.pop(key, None)
+    return job
+
+
+def job_pending(key: str) -> bool:
+    job = get_job(key)
+    return job is not None and not job.finished
+
+
+def take_finished_job(key: str) -> Job | None:
+    """끝난 작업이면 연결을 끊고 반환한다 (호출부가 결과/오류를 state에 반영).
+
+    가져간 작업은 실행기에서도 지운다 — 결과와 서류 원문이 서버 메모리에 남지 않도록.
+    """
+    job = get_job(key)
+    if job is None or not job.finished:
+        return None
+    st.session_state.jobs.pop(key, None)
+    get_job_runner().discard(job.id)
+    return job
+
+
+def drop_job(key: str) -> None:
+    """state 키에 연결된 작업을 버린다. 대기 중이면 실행기에서 빠지고, 실행 중이면 끝까지 돈 뒤 버려진다."""
+    job_id = st.session_state.jobs.pop(key, None)
+    if job_id is not None:
+        get_job_runner().discard(job_id)
+
+
+def render_job_status(keys: Iterable[str]) -> None:
+    """이 화면이 결과를 가져가는 작업(keys)이 진행 중이면 상태를 보여주고, 끝나는 대로 전체 화면을 다시 그린다.
+
+    다른 화면이 가져갈 작업은 여기서 끝나도 rerun하지 않는다 — 가져가는 쪽이 없으므로
+    매 rerun마다 다시 rerun하는 무한 루프가 된다.
+    """
+    keys = tuple(keys)
+    if any(job_pending(key) for key in keys):
+        _job_status_panel(keys)
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def _job_status_panel(keys: tuple[str, ...]) -> None:
+    runner = get_job_runner()
+    for key in keys:
+        job = get_job(key)
+        if job is None:
+            continue
+        if job.finished:
+            st.rerun()
+        label = job.meta.get("label", "작업")
+        if job.status == QUEUED:
+            position = runner.queue_position(job.id)
+            st.info(f"⏳ {label} (대기 순번: {position or '-'}번째)")
+        else:
+            elapsed = int(time.monotonic() - (job.started_at or job.submitted_at))
+            st.info(f"⚙️ {label} ({elapsed}초 경과 — 다른 화면을 눌러도 계속 진행됩니다)")
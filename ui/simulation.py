@@ -1,9 +1,29 @@
 """면접 시뮬레이션 모드 UI (실시간 채팅)."""
+import logging
+import time
+
 import streamlit as st
 
-from core.config import Settings
-from core.gemini import create_interview_chat, generate_report, get_client, stream_chat_reply
-from ui.common import error_box
+from core.caching import CREATE, DELETE, NONE, REFRESH, decide_cache_action, estimate_tokens
+from core.config import SIM_CACHE_TTL_SECONDS, Settings
+from core.gemini import (
+    build_docs_block,
+    create_interview_cache,
+    create_interview_chat,
+    delete_interview_cache,
+    generate_report,
+    get_client,
+    interview_config,
+    interview_opening,
+    is_cache_missing,
+    is_stream_interruption,
+    refresh_interview_cache,
+    stream_chat_reply,
+)
+from core.jobs import PRIORITY_CHAT, PRIORITY_REPORT, Job
+from ui.common import drop_job, error_box, get_job, job_pending, render_job_status, submit_job, take_finished_job
+
+logger = logging.getLogger(__name__)
 
 CMD_FINAL_REPORT = "'종료' 명령입니다. 위 대화 내용을 바탕으로 [면접 시뮬레이션 최종 리포트]를 생성해주세요."
 
@@ -11,55 +31,229 @@ CMD_FINAL_REPORT = "'종료' 명령입니다. 위 대화 내용을 바탕으로
 def render_simulation(settings: Settings) -> None:
     st.title("🤖 실시간 압박 면접 시뮬레이션")
 
+    _collect_final_report()
+    _collect_cache_job()
+
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
-    if user_input := st.chat_input("답변을 입력하세요..."):
+    # 이전 rerun에서 시작된 턴이 아직 진행 중이거나 끝났으면 이어서 표시하고 기록한다.
+    if (pending_turn := get_job("chat_turn")) is not None:
+        _render_turn(settings, pending_turn)
+
+    reporting = job_pending("sim_final_report")
+    if user_input := st.chat_input("답변을 입력하세요...", disabled=reporting):
         _handle_turn(settings, user_input)
 
+    render_job_status(["sim_final_report"])
     col1, col2 = st.columns(2)
     with col1:
-        if st.button("시뮬레이션 종료 및 최종 리포트 생성", use_container_width=True, type="primary"):
+        if st.button("시뮬레이션 종료 및 최종 리포트 생성", use_container_width=True, type="primary", disabled=reporting):
             _finish_with_report(settings)
     with col2:
-        if st.button("리포트 없이 종료하기", use_container_width=True):
-            _finish_without_report()
+        if st.button("리포트 없이 종료하기", use_container_width=True, disabled=reporting):
+            _finish_without_report(settings)
+
+
+def _chat_factory(settings: Settings):
+    """현재 대화 기록으로 채팅 세션을 만드는 함수 (st.session_state 값을 지금 캡처 — 워커에서도 호출 가능).
+
+    반환된 함수에 캐시 이름을 넘기면 그 explicit cache를 쓰는 세션을 만든다.
+    """
+    client = get_client(settings.api_key)
+    kwargs = dict(
+        client=client,
+        model=settings.flash_model,
+        system_prompt=settings.system_prompt,
+        life_record=st.session_state.life_record,
+        cover_letter=st.session_state.cover_letter,
+        context_reports=st.session_state.sim_context or None,
+        prior_messages=list(st.session_state.messages),
+        start_prompt=st.session_state.sim_start_prompt,
+    )
+    return lambda cached_content=None: create_interview_chat(**kwargs, cached_content=cached_content)
 
 
 def _ensure_chat(settings: Settings):
-    """채팅 세션을 반환. 유실됐으면(서버 재시작 등) 대화 기록으로 재구성한다."""
+    """채팅 세션을 반환. 유실됐으면(서버 재시작, 캐시 교체 등) 대화 기록으로 재구성한다."""
     if st.session_state.chat is None:
-        client = get_client(settings.api_key)
-        st.session_state.chat = create_interview_chat(
-            client=client,
-            model=settings.flash_model,
-            system_prompt=settings.system_prompt,
-            life_record=st.session_state.life_record,
-            cover_letter=st.session_state.cover_letter,
-            context_reports=st.session_state.sim_context or None,
-            prior_messages=st.session_state.messages,
-            start_prompt=st.session_state.sim_start_prompt,
-        )
+        cache = st.session_state.sim_cache
+        st.session_state.chat = _chat_factory(settings)(cache["name"] if cache else None)
     return st.session_state.chat
 
 
+def _cache_action(settings: Settings) -> str:
+    """비용 모델(core/caching.py)이 이번 턴에 권하는 explicit cache 조작 (계산만, API 호출 없음).
+
+    이미 만료된 캐시는 여기서 기록만 버리고 캐시 없는 세션으로 돌아간다.
+    """
+    cache = st.session_state.sim_cache
+    prefix_tokens = estimate_tokens(
+        settings.system_prompt,
+        build_docs_block(st.session_state.life_record, st.session_state.cover_letter),
+        interview_opening(st.session_state.sim_context, st.session_state.sim_start_prompt),
+        st.session_state.messages[0]["content"],
+    )
+    action = decide_cache_action(cache, prefix_tokens, st.session_state.sim_turn_times, time.time())
+    if action == NONE and cache is not None:
+        st.session_state.sim_cache = None
+        st.session_state.chat = None
+    return action
+
+
+def _cache_task(settings: Settings, action: str):
+    """action대로 explicit cache를 만들기/갱신/삭제하는 작업 함수 — 새 캐시 상태({name, expires_at} 또는 None)를 반환한다.
+
+    캐시 API는 느리므로 면접관 답변이 끝난 뒤 별도 작업으로 돌리고, 바뀐 캐시는
+    _collect_cache_job이 가져가 다음 턴부터 쓴다. 실패하면 예외가 그대로 작업 오류가 된다.
+    """
+    cache = st.session_state.sim_cache
+    client = get_client(settings.api_key)
+    create_kwargs = dict(
+        client=client,
+        model=settings.flash_model,
+        system_prompt=settings.system_prompt,
+        life_record=st.session_state.life_record,
+        cover_letter=st.session_state.cover_letter,
+        context_reports=st.session_state.sim_context or None,
+        start_prompt=st.session_state.sim_start_prompt,
+        first_question=st.session_state.messages[0]["content"],
+        ttl_seconds=SIM_CACHE_TTL_SECONDS,
+    )
+
+    def run(job: Job) -> dict | None:
+        now = time.time()
+        if action == CREATE:
+            name = create_interview_cache(**create_kwargs)
+            return {"name": name, "expires_at": now + SIM_CACHE_TTL_SECONDS}
+        if action == REFRESH:
+            refresh_interview_cache(client, cache["name"], SIM_CACHE_TTL_SECONDS)
+            return {**cache, "expires_at": now + SIM_CACHE_TTL_SECONDS}
+        delete_interview_cache(client, cache["name"])
+        return None
+
+    return run
+
+
+def _submit_cache_job(settings: Settings, action: str) -> None:
+    # 갱신/삭제할 캐시가 그사이 유실됐으면(_adopt_rebuilt_chat) 할 일이 없다.
+    if action == CREATE or (action in (REFRESH, DELETE) and st.session_state.sim_cache is not None):
+        submit_job("sim_cache", PRIORITY_CHAT, _cache_task(settings, action), label="면접 자료 캐시를 정리하고 있습니다...")
+
+
+def _collect_cache_job() -> None:
+    """끝난 캐시 작업의 결과를 반영한다. 캐시가 바뀌었으면 다음 턴에 세션을 새 캐시 기준으로 다시 만든다.
+
+    실패하면 로그만 남기고 지금 세션으로 계속한다 — 갱신 실패 시 캐시는 원래 만료 시각까지 유효하다.
+    """
+    job = take_finished_job("sim_cache")
+    if job is None:
+        return
+    if job.error is not None:
+        logger.warning("시뮬레이션 캐시 작업 실패 — 현재 세션으로 계속합니다.", exc_info=job.error)
+        return
+    previous = st.session_state.sim_cache
+    st.session_state.sim_cache = job.result
+    if (previous and previous["name"]) != (job.result and job.result["name"]):
+        st.session_state.chat = None
+
+
+def _release_sim_cache(settings: Settings) -> None:
+    drop_job("sim_cache")  # 진행 중인 캐시 생성 결과는 버린다 (TTL이 지나면 사라진다)
+    cache = st.session_state.sim_cache
+    if cache is None:
+        return
+    delete_interview_cache(get_client(settings.api_key), cache["name"])
+    st.session_state.sim_cache = None
+    st.session_state.chat = None
+
+
 def _handle_turn(settings: Settings, user_input: str) -> None:
+    st.session_state.sim_turn_times.append(time.time())
+    # 캐시 작업이 아직 돌고 있으면 이번 턴은 정책을 건너뛴다 (같은 캐시를 두 번 만들지 않도록).
+    action = NONE if job_pending("sim_cache") else _cache_action(settings)
+    try:
+        chat = _ensure_chat(settings)
+    except Exception as exc:
+        error_box("면접관 응답 생성에 실패했습니다. 같은 답변을 다시 보내주세요.", exc)
+        return
+    cache = st.session_state.sim_cache
+    new_chat = _chat_factory(settings)
+    client = get_client(settings.api_key)
+
+    def stream_reply(job: Job) -> str:
+        def on_recover(seconds: float) -> None:
+            job.meta["recovery_seconds"] = job.meta.get("recovery_seconds", 0.0) + seconds
+
+        # 일시적인 끊김은 stream_chat_reply가 받은 청크를 이어 받아 그 자리에서 복구한다.
+        config = interview_config(settings.system_prompt, cache["name"] if cache else None)
+        try:
+            for text in stream_chat_reply(chat, user_input, settings.flash_model, client, config, on_recover):
+                job.emit(text)
+        except Exception as exc:
+            if not (cache and not job.chunks and is_cache_missing(exc)):
+                raise
+            # 캐시가 예상보다 먼저 만료/삭제됨 — 캐시 없이 대화 기록으로 세션을 다시 만들어 같은 턴을 재시도한다.
+            failed_at = time.monotonic()
+            rebuilt = new_chat()
+            job.meta["rebuilt_chat"] = rebuilt
+            config = interview_config(settings.system_prompt)
+            for text in stream_chat_reply(rebuilt, user_input, settings.flash_model, client, config, on_recover):
+                if failed_at is not None:
+                    on_recover(time.monotonic() - failed_at)
+                    failed_at = None
+                job.emit(text)
+        return "".join(job.chunks)
+
+    job = submit_job(
+        "chat_turn", PRIORITY_CHAT, stream_reply,
+        label="면접관이 답변을 준비 중입니다...",
+        user_input=user_input,
+        cache_action=action,
+    )
+    _render_turn(settings, job)
+
+
+def _render_turn(settings: Settings, job: Job) -> None:
+    """채팅 턴 작업의 출력을 스트리밍으로 표시하고, 끝나면 대화 기록에 반영한다.
+
+    작업은 워커에서 계속 돌기 때문에 스트리밍 도중 rerun이 일어나도 다음 rerun에서
+    같은 작업에 다시 붙어 처음부터 이어서 보여준다. 답변이 끝난 뒤에야 캐시 작업을
+    제출해, 느린 캐시 API 호출이 첫 토큰을 늦추지 않게 한다.
+    """
+    user_input = job.meta["user_input"]
     with st.chat_message("user"):
         st.markdown(user_input)
 
     with st.chat_message("assistant"):
         try:
-            chat = _ensure_chat(settings)
-            reply = st.write_stream(stream_chat_reply(chat, user_input))
+            reply = st.write_stream(job.stream())
         except Exception as exc:
-            # 실패한 턴은 기록하지 않고, 다음 턴에서 messages 기준으로 세션을 재구성한다.
-            st.session_state.chat = None
+            # 끝까지 받지 못한 턴은 SDK 세션에도 기록되지 않으므로, 재시도를 다 쓴 일시 오류라면
+            # 세션을 그대로 두고 같은 답변을 다시 받는다. 그 밖의 오류만 messages 기준으로 재구성한다.
+            take_finished_job("chat_turn")
+            _adopt_rebuilt_chat(job)
+            if not is_stream_interruption(exc):
+                st.session_state.chat = None
             error_box("면접관 응답 생성에 실패했습니다. 같은 답변을 다시 보내주세요.", exc)
             return
 
+    take_finished_job("chat_turn")
+    _adopt_rebuilt_chat(job)
     st.session_state.messages.append({"role": "user", "content": user_input})
-    st.session_state.messages.append({"role": "assistant", "content": str(reply)})
+    assistant = {"role": "assistant", "content": str(reply)}
+    if "recovery_seconds" in job.meta:
+        assistant["recovery_seconds"] = round(job.meta["recovery_seconds"], 2)
+    st.session_state.messages.append(assistant)
+    _submit_cache_job(settings, job.meta.get("cache_action", NONE))
+
+
+def _adopt_rebuilt_chat(job: Job) -> None:
+    """턴 작업이 캐시 없이 세션을 다시 만들었으면(캐시 유실) 그 세션으로 교체한다."""
+    if (rebuilt := job.meta.get("rebuilt_chat")) is not None:
+        st.session_state.chat = rebuilt
+        st.session_state.sim_cache = None
 
 
 def _transcript_text() -> str:
@@ -75,33 +269,47 @@ def _finish_with_report(settings: Settings) -> None:
         st.warning("아직 답변한 내용이 없습니다. 최소 한 번은 답변한 뒤 리포트를 생성해주세요.")
         return
 
-    try:
-        with st.spinner("면접 전체 내용을 바탕으로 최종 리포트를 생성하고 있습니다..."):
-            client = get_client(settings.api_key)
-            report = generate_report(
-                client=client,
-                model=settings.pro_model,
-                system_prompt=settings.system_prompt,
-                life_record=st.session_state.life_record,
-                cover_letter=st.session_state.cover_letter,
-                command=CMD_FINAL_REPORT,
-                extra_context=f"[면접 전체 대화 기록]\n{_transcript_text()}",
-            )
-    except Exception as exc:
+    _release_sim_cache(settings)  # 리포트는 Pro 단발 호출이라 채팅용 캐시가 더는 필요 없다
+    client = get_client(settings.api_key)
+    life_record = st.session_state.life_record
+    cover_letter = st.session_state.cover_letter
+    transcript = _transcript_text()
+    submit_job(
+        "sim_final_report", PRIORITY_REPORT,
+        lambda job: generate_report(
+            client=client,
+            model=settings.pro_model,
+            system_prompt=settings.system_prompt,
+            life_record=life_record,
+            cover_letter=cover_letter,
+            command=CMD_FINAL_REPORT,
+            extra_context=f"[면접 전체 대화 기록]\n{transcript}",
+        ),
+        label="면접 전체 내용을 바탕으로 최종 리포트를 생성하고 있습니다...",
+    )
+    st.rerun()
+
+
+def _collect_final_report() -> None:
+    job = take_finished_job("sim_final_report")
+    if job is None:
+        return
+    if job.error is not None:
         # 대화 기록은 그대로 유지되므로 버튼을 다시 눌러 재시도할 수 있다.
-        error_box("리포트 생성 중 오류가 발생했습니다. 대화 기록은 보존되어 있으니 다시 시도해주세요.", exc)
+        error_box("리포트 생성 중 오류가 발생했습니다. 대화 기록은 보존되어 있으니 다시 시도해주세요.", job.error)
         return
-
-    _archive_and_exit(report)
+    _archive_and_exit(job.result)
 
 
-def _finish_without_report() -> None:
+def _finish_without_report(settings: Settings) -> None:
     """리포트 없이도 언제든 나갈 수 있는 탈출구 — 대화 기록은 보존된다."""
+    _release_sim_cache(settings)
     if any(m["role"] == "user" for m in st.session_state.messages):
         _archive_and_exit(report=None)
         return
     st.session_state.messages = []
     st.session_state.chat = None
+    st.session_state.sim_turn_times = []
     st.session_state.simulation_mode = False
     st.rerun()
 
@@ -112,5 +320,6 @@ def _archive_and_exit(report: str | None) -> None:
     )
     st.session_state.messages = []
     st.session_state.chat = None
+    st.session_state.sim_turn_times = []
     st.session_state.simulation_mode = False
     st.rerun()